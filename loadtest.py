@@ -0,0 +1,319 @@
+"""Concurrent-session load test for sizingApp.py.
+
+Drives N simulated planner sessions headlessly with Streamlit's AppTest, each
+running a scripted mix of location searches, route adds, slider moves and
+Calculate clicks. Geocoding goes to a local fake Nominatim server that
+injects configurable latency and timeouts. Reports rerun latency
+percentiles, memory per session and throughput.
+
+AppTest swaps a process-wide Streamlit runtime in and out around every run,
+so concurrent sessions each get their own worker process.
+
+Example::
+
+    python loadtest.py --sessions 20 --iterations 3 --latency-ms 300 --timeout-rate 0.05
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sizingApp.py")
+
+# Mix of cached IATA codes and city names that always miss the search cache
+SEARCH_TERMS = ["DEL", "BOM", "BLR", "HYD", "MAA", "COK", "CJB", "NAG", "JNB", "NBO", "Pune", "Jaipur", "Lagos", "Accra"]
+
+
+class FakeNominatim:
+    """Local stand-in for the Nominatim ``/search`` endpoint.
+
+    Every request waits ``latency_ms`` ± ``jitter_ms``. A ``timeout_rate``
+    fraction of requests instead hangs for ``hang_s`` seconds, longer than the
+    app's geocoder timeout, so the client times out (``GeocoderTimedOut``, or
+    ``GeocoderUnavailable`` once geopy's default adapter has used up its
+    retries). Results are deterministic pseudo-places derived from the query.
+    """
+
+    def __init__(self, latency_ms=200.0, jitter_ms=50.0, timeout_rate=0.0, hang_s=6.0, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.timeout_rate = timeout_rate
+        self.hang_s = hang_s
+        self.requests = 0
+        self.timeouts = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _delay(self):
+        with self._lock:
+            self.requests += 1
+            if self._rng.random() < self.timeout_rate:
+                self.timeouts += 1
+                return self.hang_s
+            return max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+
+    @staticmethod
+    def places(query, limit):
+        digest = hashlib.sha256(query.lower().encode()).digest()
+        results = []
+        for i in range(min(limit, 1 + digest[0] % 5)):
+            lat = -35 + (digest[2 * i + 1] / 255) * 70
+            lon = -20 + (digest[2 * i + 2] / 255) * 110
+            name = f"{query.title()} {i + 1}" if i else query.title()
+            results.append({
+                "place_id": int.from_bytes(digest[i:i + 4], "big"),
+                "lat": f"{lat:.5f}",
+                "lon": f"{lon:.5f}",
+                "display_name": f"{name}, Test Region",
+                "category": "place",
+                "type": "city",
+                "address": {"city": name, "state": "Test Region"},
+            })
+        return results
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                time.sleep(fake._delay())
+                if url.path.rstrip("/") != "/search":
+                    self.send_error(404)
+                    return
+                body = json.dumps(fake.places(params.get("q", [""])[0], int(params.get("limit", ["10"])[0]))).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client already gave up (timeout)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def _timed(latencies, action, label):
+    start = time.perf_counter()
+    at = action()
+    latencies.append((label, time.perf_counter() - start))
+    if at.exception:
+        raise RuntimeError(f"{label} raised: {at.exception[0].message}")
+    return at
+
+
+def _search_and_select(at, latencies, key, term):
+    react_key = at.session_state[key]["key_react"]
+    at.session_state[react_key] = {"interaction": "search", "value": term}
+    at = _timed(latencies, at.run, "search")
+    if not at.session_state[key].get("options_py"):
+        return at, False
+    react_key = at.session_state[key]["key_react"]
+    at.session_state[react_key] = {"interaction": "submit", "value": 0}
+    return _timed(latencies, at.run, "select"), True
+
+
+def _slider(at, label):
+    return next(s for s in at.slider if label in s.label)
+
+
+def _max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss / 1024**2 if sys.platform == "darwin" else rss / 1024
+
+
+_warm_rss_mb = 0.0
+
+
+def _warm_worker(timeout_s):
+    """Pay for imports and first-run caches before measuring, as a long-running server would have."""
+    global _warm_rss_mb
+    from streamlit.testing.v1 import AppTest
+
+    AppTest.from_file(APP_PATH, default_timeout=timeout_s).run()
+    _warm_rss_mb = _max_rss_mb()
+
+
+def run_session(session_id, iterations, slider_moves, timeout_s, seed):
+    """Script one planner session in this (warmed) worker process.
+
+    Returns ([(action, seconds)], session memory growth in MB, process peak RSS in MB).
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_id)
+    latencies = []
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout_s)
+    at = _timed(latencies, at.run, "load")
+
+    for iteration in range(iterations):
+        # A per-session suffix on some queries defeats the search cache
+        origin = rng.choice(SEARCH_TERMS)
+        dest = rng.choice(SEARCH_TERMS)
+        if rng.random() < 0.5:
+            dest = f"{dest} s{session_id}i{iteration}"
+        at, found_origin = _search_and_select(at, latencies, "origin_sb", origin)
+        at, found_dest = _search_and_select(at, latencies, "dest_sb", dest)
+
+        if found_origin and found_dest:
+            add = next((b for b in at.button if "Add Route" in b.label), None)
+            if add is not None:
+                at = _timed(latencies, add.click().run, "add_route")
+
+        for _ in range(slider_moves):
+            speed = _slider(at, "Cruise Speed")
+            at = _timed(latencies, speed.set_value(rng.randrange(150, 401, 10)).run, "slider")
+            altitude = _slider(at, "Altitude")
+            at = _timed(latencies, altitude.set_value(rng.randrange(3000, 16001, 500)).run, "slider")
+
+        calculate = next((b for b in at.button if "Calculate" in b.label), None)
+        if calculate is not None:
+            at = _timed(latencies, calculate.click().run, "calculate")
+
+    peak_rss = _max_rss_mb()
+    return latencies, peak_rss - _warm_rss_mb, peak_rss
+
+
+def run_load_test(sessions=10, iterations=2, slider_moves=2, latency_ms=200.0, jitter_ms=50.0,
+                  timeout_rate=0.0, hang_s=6.0, timeout_s=120.0, seed=0):
+    """Run the scripted sessions concurrently against a fake Nominatim and return a report dict."""
+    fake = FakeNominatim(latency_ms, jitter_ms, timeout_rate, hang_s, seed)
+    domain = fake.start()
+    # Read by the app on every rerun and inherited by the worker processes;
+    # restored afterwards so later geocoding in this process is unaffected
+    overrides = {"NOMINATIM_DOMAIN": domain, "NOMINATIM_SCHEME": "http"}
+    previous_env = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+
+    errors = []
+    results = []
+    try:
+        # Spawn rather than fork: this process is running the fake server's threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=sessions, mp_context=context,
+                                 initializer=_warm_worker, initargs=(timeout_s,)) as pool:
+            # Wait for every worker to be up and warm so start-up is not counted as load
+            list(pool.map(time.sleep, [0.5] * sessions))
+            start = time.perf_counter()
+            futures = [pool.submit(run_session, i, iterations, slider_moves, timeout_s, seed) for i in range(sessions)]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as exc:
+                    errors.append(repr(exc))
+            wall_s = time.perf_counter() - start
+    finally:
+        fake.stop()
+        for name, value in previous_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    latencies = [seconds for session_latencies, _, _ in results for _, seconds in session_latencies]
+    by_action = {}
+    for session_latencies, _, _ in results:
+        for action, seconds in session_latencies:
+            by_action.setdefault(action, []).append(seconds)
+
+    def percentiles(values):
+        if not values:
+            return {"n": 0}
+        p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+        return {"n": len(values), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+
+    return {
+        "sessions": sessions,
+        "completed_sessions": len(results),
+        "errors": errors,
+        "wall_s": wall_s,
+        "reruns": len(latencies),
+        "throughput_reruns_per_s": len(latencies) / wall_s if wall_s > 0 else 0.0,
+        "rerun_latency": percentiles(latencies),
+        "by_action": {action: percentiles(values) for action, values in sorted(by_action.items())},
+        "memory_per_session_mb": float(np.mean([growth for _, growth, _ in results])) if results else 0.0,
+        "peak_rss_mb": max((rss for _, _, rss in results), default=0.0),
+        "geocoder_requests": fake.requests,
+        "geocoder_timeouts": fake.timeouts,
+    }
+
+
+def print_report(report):
+    print(f"Sessions: {report['completed_sessions']}/{report['sessions']} completed in {report['wall_s']:.1f} s")
+    print(f"Throughput: {report['throughput_reruns_per_s']:.1f} reruns/s ({report['reruns']} reruns)")
+    print(f"Memory: {report['memory_per_session_mb']:.1f} MB/session (peak worker RSS {report['peak_rss_mb']:.0f} MB)")
+    print(f"Geocoder: {report['geocoder_requests']} requests, {report['geocoder_timeouts']} timeouts")
+    print()
+    print(f"{'action':<12}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = [("all", report["rerun_latency"])] + list(report["by_action"].items())
+    for action, stats in rows:
+        if stats["n"]:
+            print(f"{action:<12}{stats['n']:>6}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}{stats['p99_ms']:>10.0f}")
+    for error in report["errors"]:
+        print(f"ERROR: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated sessions")
+    parser.add_argument("--iterations", type=int, default=2, help="search/add/slider/calculate cycles per session")
+    parser.add_argument("--slider-moves", type=int, default=2, help="speed + altitude slider moves per cycle")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="mean fake geocoder latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="geocoder latency standard deviation")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of geocoder requests that hang")
+    parser.add_argument("--hang-s", type=float, default=6.0, help="how long a hanging request stalls")
+    parser.add_argument("--rerun-timeout-s", type=float, default=120.0, help="AppTest per-rerun timeout")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(
+        sessions=args.sessions,
+        iterations=args.iterations,
+        slider_moves=args.slider_moves,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        timeout_rate=args.timeout_rate,
+        hang_s=args.hang_s,
+        timeout_s=args.rerun_timeout_s,
+        seed=args.seed,
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    # Run through the importable module: AppTest rebinds __main__ to the app
+    # script inside the workers, so functions pickled from __main__ would not resolve
+    import loadtest
+
+    sys.exit(loadtest.main())
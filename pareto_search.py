@@ -0,0 +1,248 @@
+"""NSGA-II multi-objective search over the sizing model's design variables.
+
+Populations are evaluated in batches with one vectorised atmosphere lookup
+per batch, and domination is counted in fixed-size blocks rather than as one
+population-squared matrix, so generations of thousands of designs run
+in-process in seconds and bounded memory. The search minimises MTOW, block
+time and energy per passenger-km over the current route set and returns the
+non-dominated (Pareto) designs.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sizing_model import BLOCK_OVERHEAD_H, air_density, route_performance, size_aircraft
+
+# (name, lower bound, upper bound)
+DESIGN_VARIABLES = [
+    ("ar_guess", 8.0, 16.0),
+    ("target_cl", 0.4, 0.9),
+    ("parachute_mass_kg", 40.0, 80.0),
+    ("cruise_speed_kmh", 150.0, 400.0),
+    ("cruise_altitude_ft", 3000.0, 16000.0),
+]
+
+OBJECTIVES = ["mtow_kg", "block_time_h", "energy_kwh_per_pax_km"]
+
+
+def decode(x):
+    """Map a design vector to sizing-model keyword arguments."""
+    return {name: float(value) for (name, _, _), value in zip(DESIGN_VARIABLES, x)}
+
+
+def evaluate(base_inputs, routes, design):
+    """Size one design and return (objectives, constraint violation, sizing result)."""
+    inputs = {**base_inputs, **design}
+    inputs["max_dist_km"] = max(r['dist_km'] for r in routes)
+    result = size_aircraft(**inputs)
+    performance = route_performance(result, routes)
+
+    block_time_h = sum(p["flight_time_h"] + BLOCK_OVERHEAD_H for p in performance) / len(performance)
+    # Cargo-only designs are scored per payload-carrying flight rather than per seat
+    pax = max(result["num_pass"], 1)
+    pax_km = sum(pax * p["dist_km"] for p in performance)
+    energy_per_pax_km = sum(p["mission_kwh"] for p in performance) / pax_km if pax_km > 0 else float("inf")
+
+    # The battery/power ratio check is only a warning in the app, so it is reported rather than enforced.
+    # Hybrids cruise on turboprops, so the battery is not expected to cover the whole mission.
+    violation = 0.0
+    if not result["is_hybrid"]:
+        violation = sum(max(0.0, -p["margin_pct"]) / 100 for p in performance)
+
+    objectives = (result["total_mass_kg"], block_time_h, energy_per_pax_km)
+    return objectives, violation, result
+
+
+def _evaluate_batch(args):
+    base_inputs, routes, X = args
+    F = np.empty((len(X), len(OBJECTIVES)))
+    CV = np.empty(len(X))
+    charger_kw = np.empty(len(X))
+    battery_feasible = np.empty(len(X), dtype=bool)
+    # One vectorised atmosphere lookup per batch instead of one per design
+    altitude_col = [name for name, _, _ in DESIGN_VARIABLES].index("cruise_altitude_ft")
+    rho = np.asarray(air_density(X[:, altitude_col] * 0.3048), dtype=float).reshape(len(X))
+    for i, x in enumerate(X):
+        objectives, violation, result = evaluate({**base_inputs, "rho": float(rho[i])}, routes, decode(x))
+        F[i] = objectives
+        CV[i] = violation
+        charger_kw[i] = result["charger_kw"]
+        battery_feasible[i] = result["battery_feasible"]
+    return F, CV, charger_kw, battery_feasible
+
+
+def _evaluate_population(executor, n_chunks, base_inputs, routes, X):
+    chunks = [c for c in np.array_split(X, n_chunks) if len(c)]
+    if executor is None:
+        parts = [_evaluate_batch((base_inputs, routes, c)) for c in chunks]
+    else:
+        parts = list(executor.map(_evaluate_batch, [(base_inputs, routes, c) for c in chunks]))
+    return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+
+# Domination is evaluated in row blocks of at most this many pairs, so memory stays
+# bounded however large the population
+DOMINATION_BLOCK_PAIRS = 2 ** 22
+
+
+def _domination_rows(F, CV, rows):
+    """D[r, j] is True when design ``rows[r]`` constraint-dominates design j."""
+    feasible = CV <= 0
+    Fr, CVr, feasible_r = F[rows], CV[rows], feasible[rows]
+    le = np.ones((len(rows), len(F)), dtype=bool)
+    lt = np.zeros((len(rows), len(F)), dtype=bool)
+    for k in range(F.shape[1]):
+        le &= Fr[:, None, k] <= F[None, :, k]
+        lt |= Fr[:, None, k] < F[None, :, k]
+    D = le & lt & feasible_r[:, None] & feasible[None, :]
+    D |= feasible_r[:, None] & ~feasible[None, :]
+    D |= ~feasible_r[:, None] & ~feasible[None, :] & (CVr[:, None] < CV[None, :])
+    return D
+
+
+def _dominated_counts(F, CV, rows):
+    """Number of designs in ``rows`` that dominate each design, built block by block."""
+    counts = np.zeros(len(F), dtype=np.int64)
+    block = max(1, DOMINATION_BLOCK_PAIRS // max(len(F), 1))
+    for start in range(0, len(rows), block):
+        counts += _domination_rows(F, CV, rows[start:start + block]).sum(axis=0, dtype=np.int64)
+    return counts
+
+
+def non_dominated_sort(F, CV):
+    """Return a rank per design (0 = first front)."""
+    dominated_by = _dominated_counts(F, CV, np.arange(len(F)))
+    rank = np.full(len(F), -1)
+    current = np.flatnonzero(dominated_by == 0)
+    level = 0
+    while len(current):
+        rank[current] = level
+        dominated_by = dominated_by - _dominated_counts(F, CV, current)
+        dominated_by[rank >= 0] = -1
+        current = np.flatnonzero(dominated_by == 0)
+        level += 1
+    return rank
+
+
+def crowding_distance(F):
+    n, m = F.shape
+    distance = np.zeros(n)
+    if n <= 2:
+        distance[:] = np.inf
+        return distance
+    for k in range(m):
+        order = np.argsort(F[:, k])
+        span = F[order[-1], k] - F[order[0], k]
+        distance[order[0]] = distance[order[-1]] = np.inf
+        if span > 0:
+            distance[order[1:-1]] += (F[order[2:], k] - F[order[:-2], k]) / span
+    return distance
+
+
+def _crowding_by_front(F, rank):
+    crowding = np.zeros(len(F))
+    for level in np.unique(rank):
+        members = np.flatnonzero(rank == level)
+        crowding[members] = crowding_distance(F[members])
+    return crowding
+
+
+def _tournament(rng, rank, crowding, n):
+    a = rng.integers(0, len(rank), n)
+    b = rng.integers(0, len(rank), n)
+    a_wins = (rank[a] < rank[b]) | ((rank[a] == rank[b]) & (crowding[a] > crowding[b]))
+    return np.where(a_wins, a, b)
+
+
+def _sbx_crossover(rng, P1, P2, eta=15.0, p_cross=0.9):
+    u = rng.random(P1.shape)
+    beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta + 1)), (1 / (2 * (1 - u))) ** (1 / (eta + 1)))
+    cross = rng.random((len(P1), 1)) < p_cross
+    beta = np.where(cross, beta, 1.0)
+    C1 = 0.5 * ((1 + beta) * P1 + (1 - beta) * P2)
+    C2 = 0.5 * ((1 - beta) * P1 + (1 + beta) * P2)
+    return np.clip(C1, 0, 1), np.clip(C2, 0, 1)
+
+
+def _polynomial_mutation(rng, X, eta=20.0):
+    p_mut = 1 / X.shape[1]
+    u = rng.random(X.shape)
+    delta = np.where(u < 0.5, (2 * u) ** (1 / (eta + 1)) - 1, 1 - (2 * (1 - u)) ** (1 / (eta + 1)))
+    mutate = rng.random(X.shape) < p_mut
+    return np.clip(X + np.where(mutate, delta, 0.0), 0, 1)
+
+
+def run_nsga2(base_inputs, routes, pop_size=200, n_generations=30, n_workers=1, seed=0, progress=None):
+    """Search the design variables for the MTOW / block time / energy-per-pax-km Pareto front.
+
+    ``base_inputs`` holds the fixed sizing-model inputs from the configuration
+    panel; every entry in ``DESIGN_VARIABLES`` is overridden per design.
+    By default designs are evaluated in-process; ``n_workers > 1`` uses a
+    spawn process pool, which is only safe from a plain script (under
+    Streamlit ``__main__`` is the app, which spawned workers would re-run,
+    and forking the multi-threaded server can deadlock). ``progress(generation, n_generations)``
+    is called after each generation. Returns the feasible first-front designs
+    as a list of dicts sorted by MTOW.
+    """
+    rng = np.random.default_rng(seed)
+    lower = np.array([lo for _, lo, _ in DESIGN_VARIABLES])
+    upper = np.array([hi for _, _, hi in DESIGN_VARIABLES])
+    design_names = {name for name, _, _ in DESIGN_VARIABLES}
+    base_inputs = {k: v for k, v in base_inputs.items() if k not in design_names}
+
+    n_workers = n_workers or os.cpu_count() or 1
+    n_chunks = n_workers * 4
+    executor = ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")) if n_workers > 1 else None
+
+    def scale(U):
+        return lower + U * (upper - lower)
+
+    try:
+        U = rng.random((pop_size, len(DESIGN_VARIABLES)))
+        F, CV, charger, battery_ok = _evaluate_population(executor, n_chunks, base_inputs, routes, scale(U))
+        rank = non_dominated_sort(F, CV)
+        crowding = _crowding_by_front(F, rank)
+
+        for generation in range(n_generations):
+            parents = _tournament(rng, rank, crowding, pop_size + pop_size % 2)
+            P1, P2 = U[parents[0::2]], U[parents[1::2]]
+            C1, C2 = _sbx_crossover(rng, P1, P2)
+            offspring = _polynomial_mutation(rng, np.vstack([C1, C2]))[:pop_size]
+            F_off, CV_off, charger_off, battery_ok_off = _evaluate_population(executor, n_chunks, base_inputs, routes, scale(offspring))
+
+            U_all = np.vstack([U, offspring])
+            F_all = np.vstack([F, F_off])
+            CV_all = np.concatenate([CV, CV_off])
+            charger_all = np.concatenate([charger, charger_off])
+            battery_ok_all = np.concatenate([battery_ok, battery_ok_off])
+
+            rank_all = non_dominated_sort(F_all, CV_all)
+            crowding_all = _crowding_by_front(F_all, rank_all)
+            survivors = np.lexsort((-crowding_all, rank_all))[:pop_size]
+
+            U, F, CV = U_all[survivors], F_all[survivors], CV_all[survivors]
+            charger, battery_ok = charger_all[survivors], battery_ok_all[survivors]
+            rank, crowding = rank_all[survivors], crowding_all[survivors]
+
+            if progress is not None:
+                progress(generation + 1, n_generations)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    front = np.flatnonzero((rank == 0) & (CV <= 0))
+    X = scale(U)
+    designs = []
+    for i in front[np.argsort(F[front, 0])]:
+        design = decode(X[i])
+        designs.append({
+            "design": design,
+            "mtow_kg": float(F[i, 0]),
+            "block_time_h": float(F[i, 1]),
+            "energy_kwh_per_pax_km": float(F[i, 2]),
+            "charger_kw": float(charger[i]),
+            "battery_feasible": bool(battery_ok[i]),
+        })
+    return designs
@@ -0,0 +1,196 @@
+"""Range-limited multi-hop routing with charging stops.
+
+Airports become graph nodes joined by every leg the sized aircraft can fly
+nonstop. Leg cost is block time plus the time to recharge the battery energy
+that leg uses at ``charger_kw`` and, for hybrids, to refuel; the fastest
+itinerary between any two airports is found with A* using a great-circle
+time heuristic. Graphs are cached per aircraft design
+so repeated origin/destination queries only pay for the search.
+"""
+import heapq
+import math
+from functools import lru_cache
+
+from geopy.distance import geodesic
+
+from sizing_model import BLOCK_OVERHEAD_H, USABLE_FRACTION, energy_per_km_kwh, max_leg_km
+
+EARTH_RADIUS_KM = 6371.0
+# A spherical great circle can run slightly longer than the WGS-84 geodesic
+# used for leg lengths, so it is shrunk to keep the A* heuristic admissible
+HEURISTIC_FACTOR = 0.99
+# Turnaround to refuel a hybrid's turboprops at an intermediate stop
+HYBRID_REFUEL_H = 0.25
+
+
+def great_circle_km(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class RouteGraph:
+    """Airports joined by every leg the aircraft can fly nonstop.
+
+    ``airports`` maps code -> (lat, lon, name), like ``COMMON_AIRPORTS``. The
+    aircraft leaves the origin fully charged and fuelled. Before each following
+    leg it recharges that leg's battery energy, ``fixed_leg_kwh`` plus
+    ``kwh_per_km`` per km and at most ``max_charge_kwh``, then spends
+    ``refuel_h`` refuelling.
+    """
+
+    def __init__(self, airports, max_leg_km, cruise_speed_kmh, charger_kw, kwh_per_km, fixed_leg_kwh,
+                 max_charge_kwh=math.inf, refuel_h=0.0):
+        self.airports = dict(airports)
+        self.max_leg_km = max_leg_km
+        self.cruise_speed_kmh = cruise_speed_kmh
+        self.charger_kw = charger_kw
+        self.kwh_per_km = kwh_per_km
+        self.fixed_leg_kwh = fixed_leg_kwh
+        self.max_charge_kwh = max_charge_kwh
+        self.refuel_h = refuel_h
+        self.adjacency = {code: [] for code in self.airports}
+        self._itineraries = {}
+
+        codes = list(self.airports)
+        for i, a in enumerate(codes):
+            a_lat, a_lon, _ = self.airports[a]
+            for b in codes[i + 1:]:
+                b_lat, b_lon, _ = self.airports[b]
+                # Cheap spherical pre-filter before the exact geodesic
+                if great_circle_km(a_lat, a_lon, b_lat, b_lon) * HEURISTIC_FACTOR > max_leg_km:
+                    continue
+                dist_km = geodesic((a_lat, a_lon), (b_lat, b_lon)).km
+                if dist_km <= max_leg_km:
+                    self.adjacency[a].append((b, dist_km))
+                    self.adjacency[b].append((a, dist_km))
+
+    def block_time_h(self, dist_km):
+        return dist_km / self.cruise_speed_kmh + BLOCK_OVERHEAD_H
+
+    def charge_time_h(self, dist_km):
+        return min(self.fixed_leg_kwh + self.kwh_per_km * dist_km, self.max_charge_kwh) / self.charger_kw
+
+    def stop_time_h(self, dist_km):
+        """Ground time at an intermediate stop before a leg of ``dist_km``."""
+        return self.charge_time_h(dist_km) + self.refuel_h
+
+    def _heuristic_h(self, code, dest):
+        if code == dest:
+            return 0.0
+        lat, lon, _ = self.airports[code]
+        d_lat, d_lon, _ = self.airports[dest]
+        gc_km = great_circle_km(lat, lon, d_lat, d_lon) * HEURISTIC_FACTOR
+        return gc_km / self.cruise_speed_kmh + BLOCK_OVERHEAD_H
+
+    def fastest_itinerary(self, origin, dest):
+        """Fastest itinerary from ``origin`` to ``dest`` (airport codes), or None if unreachable.
+
+        Returns a dict with ``stops`` (codes including both ends), ``legs``
+        (from, to, dist_km, block_h, charge_h, refuel_h) and ``total_h``.
+        """
+        key = (origin, dest)
+        if key not in self._itineraries:
+            self._itineraries[key] = self._search(origin, dest)
+        return self._itineraries[key]
+
+    def _search(self, origin, dest):
+        if origin not in self.airports or dest not in self.airports:
+            return None
+        best = {origin: 0.0}
+        previous = {}
+        frontier = [(self._heuristic_h(origin, dest), 0.0, origin)]
+        while frontier:
+            _, elapsed_h, code = heapq.heappop(frontier)
+            if code == dest:
+                break
+            if elapsed_h > best[code]:
+                continue
+            for neighbour, dist_km in self.adjacency[code]:
+                stop_h = 0.0 if code == origin else self.stop_time_h(dist_km)
+                candidate = elapsed_h + stop_h + self.block_time_h(dist_km)
+                if candidate < best.get(neighbour, math.inf):
+                    best[neighbour] = candidate
+                    previous[neighbour] = (code, dist_km)
+                    heapq.heappush(frontier, (candidate + self._heuristic_h(neighbour, dest), candidate, neighbour))
+        else:
+            return None
+
+        legs = []
+        code = dest
+        while code != origin:
+            prev, dist_km = previous[code]
+            legs.append({
+                "from": prev,
+                "to": code,
+                "dist_km": dist_km,
+                "block_h": self.block_time_h(dist_km),
+                "charge_h": 0.0 if prev == origin else self.charge_time_h(dist_km),
+                "refuel_h": 0.0 if prev == origin else self.refuel_h,
+            })
+            code = prev
+        legs.reverse()
+        return {
+            "stops": [origin] + [leg["to"] for leg in legs],
+            "legs": legs,
+            "total_h": best[dest],
+        }
+
+
+@lru_cache(maxsize=32)
+def _cached_graph(airports, *args):
+    return RouteGraph(dict(airports), *args)
+
+
+def graph_for_design(result, airports):
+    """Cached ``RouteGraph`` for a ``size_aircraft`` result over ``airports``.
+
+    All-electric legs recharge their taxi energy plus the per-km flight energy.
+    Hybrids cruise on the turboprops, so each leg only recharges the electric
+    taxi, climb and descent, and every stop also refuels.
+    """
+    if result["is_hybrid"]:
+        kwh_per_km = 0.0
+        fixed_leg_kwh = (result["e_taxi_j"] + result["e_climb_j"] + result["e_descent_j"]) / 3.6e6
+        refuel_h = HYBRID_REFUEL_H
+    else:
+        kwh_per_km = energy_per_km_kwh(result)
+        fixed_leg_kwh = result["e_taxi_j"] / 3.6e6
+        refuel_h = 0.0
+    return _cached_graph(
+        tuple(sorted(airports.items())),
+        max_leg_km(result),
+        result["cruise_speed_kmh"],
+        result["charger_kw"],
+        kwh_per_km,
+        fixed_leg_kwh,
+        result["battery_kwh"] * USABLE_FRACTION,
+        refuel_h,
+    )
+
+
+def airports_with_routes(airports, routes):
+    """Add route endpoints that are not already airports.
+
+    Returns the merged airport dict and, for each route, its
+    (origin code, destination code). Endpoints are matched to existing
+    airports by coordinates rounded to 0.01°, as the location search does.
+    """
+    merged = dict(airports)
+    by_coords = {(round(lat, 2), round(lon, 2)): code for code, (lat, lon, _) in airports.items()}
+    endpoints = []
+    for r in routes:
+        pair = []
+        for lat_k, lon_k, name_k in [('origin_lat', 'origin_lon', 'origin_name'), ('dest_lat', 'dest_lon', 'dest_name')]:
+            coord_key = (round(r[lat_k], 2), round(r[lon_k], 2))
+            if coord_key not in by_coords:
+                code = r[name_k]
+                while code in merged:
+                    code += "*"
+                merged[code] = (r[lat_k], r[lon_k], r[name_k])
+                by_coords[coord_key] = code
+            pair.append(by_coords[coord_key])
+        endpoints.append(tuple(pair))
+    return merged, endpoints
@@ -0,0 +1,298 @@
+"""Shared, persistent store of route sets, sizing inputs and computed results.
+
+Scenarios live in a SQLite database in WAL mode so several app workers can
+read while one writes. Route endpoints, route distance and the headline
+outputs are indexed, so queries such as "designs under 3,000 kg MTOW that
+cover BLR-HYD" are answered from the indexes. Saved results are stored as
+computed, so loading a scenario needs no re-sizing. Bulk import/export is
+JSON Lines, streamed one scenario at a time.
+
+Usage::
+
+    python scenario_store.py export scenarios.jsonl
+    python scenario_store.py import scenarios.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_DB_PATH = os.environ.get(
+    "SCENARIO_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.db"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    inputs_json TEXT NOT NULL,
+    result_json TEXT,
+    is_hybrid INTEGER,
+    num_pass INTEGER,
+    max_dist_km REAL,
+    mtow_kg REAL,
+    battery_kwh REAL,
+    wing_area REAL,
+    charger_kw REAL
+);
+CREATE TABLE IF NOT EXISTS routes (
+    id INTEGER PRIMARY KEY,
+    scenario_id INTEGER NOT NULL REFERENCES scenarios(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    origin_name TEXT,
+    origin_lat REAL,
+    origin_lon REAL,
+    dest_name TEXT,
+    dest_lat REAL,
+    dest_lon REAL,
+    dist_km REAL,
+    -- Endpoint keys in sorted order, so a route matches in either direction
+    a_key TEXT NOT NULL,
+    b_key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_routes_endpoints ON routes(a_key, b_key, scenario_id);
+CREATE INDEX IF NOT EXISTS idx_routes_scenario ON routes(scenario_id, seq);
+CREATE INDEX IF NOT EXISTS idx_routes_dist ON routes(dist_km);
+CREATE INDEX IF NOT EXISTS idx_scenarios_mtow ON scenarios(mtow_kg);
+CREATE INDEX IF NOT EXISTS idx_scenarios_battery ON scenarios(battery_kwh);
+CREATE INDEX IF NOT EXISTS idx_scenarios_charger ON scenarios(charger_kw);
+CREATE INDEX IF NOT EXISTS idx_scenarios_max_dist ON scenarios(max_dist_km);
+CREATE INDEX IF NOT EXISTS idx_scenarios_created ON scenarios(created_at);
+"""
+
+SUMMARY_COLUMNS = "s.id, s.name, s.created_at, s.is_hybrid, s.num_pass, s.max_dist_km, s.mtow_kg, s.battery_kwh, s.wing_area, s.charger_kw"
+
+
+def endpoint_key(lat, lon):
+    """Endpoint identity at 0.01° (~1 km), as the app's location search de-duplicates."""
+    return f"{round(lat, 2):.2f},{round(lon, 2):.2f}"
+
+
+def _route_keys(route):
+    a = endpoint_key(route["origin_lat"], route["origin_lon"])
+    b = endpoint_key(route["dest_lat"], route["dest_lon"])
+    return (a, b) if a <= b else (b, a)
+
+
+def _summary(row):
+    keys = ["id", "name", "created_at", "is_hybrid", "num_pass", "max_dist_km", "mtow_kg", "battery_kwh", "wing_area", "charger_kw"]
+    return dict(zip(keys, row))
+
+
+class ScenarioStore:
+    """SQLite-backed scenario store, safe to share between threads and processes.
+
+    Each thread gets its own connection. Writes are single transactions and
+    wait up to ``busy_timeout_s`` for other writers.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, busy_timeout_s=10.0):
+        self.path = path
+        self.busy_timeout_s = busy_timeout_s
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_s)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _insert(self, conn, name, inputs, routes, result, created_at):
+        result = result or {}
+        cursor = conn.execute(
+            "INSERT INTO scenarios (name, created_at, inputs_json, result_json, is_hybrid, num_pass,"
+            " max_dist_km, mtow_kg, battery_kwh, wing_area, charger_kw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                name,
+                created_at,
+                json.dumps(inputs),
+                json.dumps(result) if result else None,
+                int(bool(inputs.get("is_hybrid"))),
+                inputs.get("num_pass"),
+                max((r["dist_km"] for r in routes), default=None),
+                result.get("total_mass_kg"),
+                result.get("battery_kwh"),
+                result.get("wing_area"),
+                result.get("charger_kw"),
+            ),
+        )
+        scenario_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO routes (scenario_id, seq, origin_name, origin_lat, origin_lon, dest_name, dest_lat,"
+            " dest_lon, dist_km, a_key, b_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    scenario_id, seq, r["origin_name"], r["origin_lat"], r["origin_lon"],
+                    r["dest_name"], r["dest_lat"], r["dest_lon"], r["dist_km"], *_route_keys(r),
+                )
+                for seq, r in enumerate(routes)
+            ],
+        )
+        return scenario_id
+
+    def save_scenario(self, name, inputs, routes, result=None):
+        """Save a route set, its ``size_aircraft`` inputs and (optionally) the computed result. Returns the id."""
+        conn = self._connection()
+        with conn:
+            return self._insert(conn, name, inputs, routes, result, time.time())
+
+    def load_scenario(self, scenario_id):
+        """Return ``{id, name, created_at, inputs, routes, result}`` or None if there is no such scenario."""
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT id, name, created_at, inputs_json, result_json FROM scenarios WHERE id = ?",
+            (scenario_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        routes = conn.execute(
+            "SELECT origin_name, origin_lat, origin_lon, dest_name, dest_lat, dest_lon, dist_km"
+            " FROM routes WHERE scenario_id = ? ORDER BY seq",
+            (scenario_id,),
+        ).fetchall()
+        return {
+            "id": row[0],
+            "name": row[1],
+            "created_at": row[2],
+            "inputs": json.loads(row[3]),
+            "routes": [self._route_dict(r) for r in routes],
+            "result": json.loads(row[4]) if row[4] else None,
+        }
+
+    @staticmethod
+    def _route_dict(row):
+        keys = ["origin_name", "origin_lat", "origin_lon", "dest_name", "dest_lat", "dest_lon", "dist_km"]
+        route = dict(zip(keys, row))
+        # The column is REAL; the app stores whole kilometres, so hand them back as ints
+        dist = route["dist_km"]
+        if isinstance(dist, float) and dist.is_integer():
+            route["dist_km"] = int(dist)
+        return route
+
+    def delete_scenario(self, scenario_id):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+
+    def list_scenarios(self, limit=50):
+        """Most recently saved scenarios, newest first, as summary dicts."""
+        rows = self._connection().execute(
+            f"SELECT {SUMMARY_COLUMNS} FROM scenarios s ORDER BY s.created_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [_summary(r) for r in rows]
+
+    def query(self, max_mtow_kg=None, max_battery_kwh=None, max_charger_kw=None,
+              min_max_dist_km=None, covers=None, is_hybrid=None, limit=100):
+        """Summaries of scenarios matching every given filter, lightest first.
+
+        ``covers`` is a pair of (lat, lon) endpoints that one of the scenario's
+        routes must connect, in either direction.
+        """
+        joins = ""
+        where = ["s.result_json IS NOT NULL"]
+        params = []
+        if covers is not None:
+            (lat1, lon1), (lat2, lon2) = covers
+            a, b = sorted([endpoint_key(lat1, lon1), endpoint_key(lat2, lon2)])
+            joins = " JOIN (SELECT DISTINCT scenario_id FROM routes WHERE a_key = ? AND b_key = ?) c ON c.scenario_id = s.id"
+            params += [a, b]
+        for column, op, value in [
+            ("s.mtow_kg", "<=", max_mtow_kg),
+            ("s.battery_kwh", "<=", max_battery_kwh),
+            ("s.charger_kw", "<=", max_charger_kw),
+            ("s.max_dist_km", ">=", min_max_dist_km),
+        ]:
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        if is_hybrid is not None:
+            where.append("s.is_hybrid = ?")
+            params.append(int(is_hybrid))
+
+        sql = f"SELECT {SUMMARY_COLUMNS} FROM scenarios s{joins} WHERE {' AND '.join(where)} ORDER BY s.mtow_kg LIMIT ?"
+        rows = self._connection().execute(sql, params + [limit]).fetchall()
+        return [_summary(r) for r in rows]
+
+    def export_jsonl(self, fp, batch_size=500):
+        """Write every scenario to ``fp`` as one JSON line each, streaming from the database. Returns the count."""
+        cursor = self._connection().execute(
+            "SELECT s.id, s.name, s.created_at, s.inputs_json, s.result_json,"
+            " r.origin_name, r.origin_lat, r.origin_lon, r.dest_name, r.dest_lat, r.dest_lon, r.dist_km"
+            " FROM scenarios s LEFT JOIN routes r ON r.scenario_id = s.id ORDER BY s.id, r.seq"
+        )
+        cursor.arraysize = batch_size
+        rows = itertools.chain.from_iterable(iter(cursor.fetchmany, []))
+        count = 0
+        for _, group in itertools.groupby(rows, key=lambda row: row[0]):
+            group = list(group)
+            _, name, created_at, inputs_json, result_json = group[0][:5]
+            routes = [self._route_dict(row[5:]) for row in group if row[5] is not None]
+            fp.write(json.dumps({
+                "name": name,
+                "created_at": created_at,
+                "inputs": json.loads(inputs_json),
+                "routes": routes,
+                "result": json.loads(result_json) if result_json else None,
+            }) + "\n")
+            count += 1
+        return count
+
+    def import_jsonl(self, fp, batch_size=500):
+        """Read scenarios from JSON lines in ``fp``, committing every ``batch_size``. Returns the count."""
+        conn = self._connection()
+        count = 0
+        lines = (line for line in fp if line.strip())
+        while True:
+            batch = list(itertools.islice(lines, batch_size))
+            if not batch:
+                break
+            with conn:
+                for line in batch:
+                    item = json.loads(line)
+                    self._insert(
+                        conn, item["name"], item["inputs"], item["routes"], item.get("result"),
+                        item.get("created_at", time.time()),
+                    )
+            count += len(batch)
+        return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import/export of saved sizing scenarios.")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("file", help="JSON Lines file ('-' for stdin/stdout)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="scenario database path")
+    args = parser.parse_args(argv)
+
+    store = ScenarioStore(args.db)
+    if args.command == "export":
+        if args.file == "-":
+            count = store.export_jsonl(sys.stdout)
+        else:
+            with open(args.file, "w") as f:
+                count = store.export_jsonl(f)
+        print(f"Exported {count} scenarios", file=sys.stderr)
+    else:
+        if args.file == "-":
+            count = store.import_jsonl(sys.stdin)
+        else:
+            with open(args.file) as f:
+                count = store.import_jsonl(f)
+        print(f"Imported {count} scenarios", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
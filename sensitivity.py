@@ -0,0 +1,173 @@
+"""Analytic sensitivities of the sizing outputs to every input.
+
+``size_aircraft`` is evaluated once per design point on forward-mode dual
+numbers whose tangent carries one slot per input, so a single pass yields
+the full Jacobian instead of 2×N finite-difference reruns. The only
+non-Python piece of the model, the atmosphere, is differentiated exactly with
+CasADi and evaluated for the whole batch of design points in one call.
+"""
+import inspect
+import math
+import warnings
+from functools import lru_cache
+
+import aerosandbox as asb
+import casadi as cas
+import numpy as np
+
+from sizing_model import route_performance, size_aircraft
+
+# Continuous size_aircraft inputs that sensitivities are taken with respect to
+INPUTS = [
+    "max_dist_km",
+    "num_pass",
+    "cargo_kg",
+    "cruise_speed_kmh",
+    "cruise_altitude_ft",
+    "battery_density",
+    "efficiency",
+    "peak_to_cruise_ratio",
+    "desired_charge_time_h",
+    "parasite_cd0",
+    "empty_base_kg",
+    "pass_weight_kg",
+    "turboprop_cruise_fraction",
+    "cruise_fuel_consumption_kgh",
+    "ar_guess",
+    "target_cl",
+    "parachute_mass_kg",
+]
+
+OUTPUTS = ["total_mass_kg", "battery_kwh", "wing_area", "ld_final", "charger_kw"]
+
+
+class Dual:
+    """Forward-mode dual number: a value and its gradient with respect to every seeded input."""
+
+    __slots__ = ("val", "dot")
+
+    def __init__(self, val, dot):
+        self.val = val
+        self.dot = dot
+
+    @staticmethod
+    def _parts(other):
+        if isinstance(other, Dual):
+            return other.val, other.dot
+        return other, 0.0
+
+    def __add__(self, other):
+        val, dot = self._parts(other)
+        return Dual(self.val + val, self.dot + dot)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        val, dot = self._parts(other)
+        return Dual(self.val - val, self.dot - dot)
+
+    def __rsub__(self, other):
+        return Dual(other - self.val, -self.dot)
+
+    def __neg__(self):
+        return Dual(-self.val, -self.dot)
+
+    def __mul__(self, other):
+        val, dot = self._parts(other)
+        return Dual(self.val * val, self.dot * val + self.val * dot)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        val, dot = self._parts(other)
+        return Dual(self.val / val, (self.dot * val - self.val * dot) / val**2)
+
+    def __rtruediv__(self, other):
+        return Dual(other / self.val, -other * self.dot / self.val**2)
+
+    def __pow__(self, power):
+        if isinstance(power, Dual):
+            val = self.val ** power.val
+            return Dual(val, power.val * self.val ** (power.val - 1) * self.dot + val * math.log(self.val) * power.dot)
+        return Dual(self.val ** power, power * self.val ** (power - 1) * self.dot)
+
+    def __rpow__(self, base):
+        val = base ** self.val
+        return Dual(val, val * math.log(base) * self.dot)
+
+    # Comparisons follow the value, so the model's branches and clips behave as in a plain run
+    def __lt__(self, other):
+        return self.val < self._parts(other)[0]
+
+    def __le__(self, other):
+        return self.val <= self._parts(other)[0]
+
+    def __gt__(self, other):
+        return self.val > self._parts(other)[0]
+
+    def __ge__(self, other):
+        return self.val >= self._parts(other)[0]
+
+    def __round__(self, ndigits=None):
+        return round(self.val, ndigits)
+
+
+@lru_cache(maxsize=None)
+def _density_function():
+    altitude = cas.MX.sym("altitude")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        rho = asb.Atmosphere(altitude=altitude).density()
+    return cas.Function("density", [altitude], [rho, cas.jacobian(rho, altitude)])
+
+
+def density_with_gradient(altitudes_m):
+    """ISA density and d(density)/d(altitude) for an array of altitudes, in one CasADi call."""
+    altitudes_m = np.asarray(altitudes_m, dtype=float).reshape(1, -1)
+    rho, drho = _density_function().map(altitudes_m.shape[1])(altitudes_m)
+    return np.asarray(rho).ravel(), np.asarray(drho).ravel()
+
+
+def _value(x):
+    return x.val if isinstance(x, Dual) else x
+
+
+def _gradient(x, n):
+    return np.broadcast_to(x.dot, n).copy() if isinstance(x, Dual) else np.zeros(n)
+
+
+def sizing_jacobians(points, routes=None):
+    """Outputs and their Jacobians for a batch of design points.
+
+    ``points`` is a list of ``size_aircraft`` keyword-argument dicts. For each
+    point returns a dict with ``values`` (output -> float) and ``jacobian``
+    (output -> array over ``INPUTS``). When ``routes`` is given the per-route
+    battery margin is included as ``route_margin_pct`` (a list of values and
+    an ``(n_routes, len(INPUTS))`` Jacobian).
+    """
+    defaults = {name: param.default for name, param in inspect.signature(size_aircraft).parameters.items()}
+
+    altitudes_m = [p.get("cruise_altitude_ft", defaults["cruise_altitude_ft"]) * 0.3048 for p in points]
+    rho, drho_dh = density_with_gradient(altitudes_m)
+
+    n = len(INPUTS)
+    seeds = np.eye(n)
+    altitude_index = INPUTS.index("cruise_altitude_ft")
+    results = []
+    for point, rho_i, drho_i in zip(points, rho, drho_dh):
+        inputs = dict(point)
+        for i, name in enumerate(INPUTS):
+            inputs[name] = Dual(float(inputs.get(name, defaults[name])), seeds[i])
+        inputs["rho"] = Dual(float(rho_i), drho_i * 0.3048 * seeds[altitude_index])
+
+        result = size_aircraft(**inputs)
+        values = {name: float(_value(result[name])) for name in OUTPUTS}
+        jacobian = {name: _gradient(result[name], n) for name in OUTPUTS}
+
+        if routes is not None:
+            margins = [p["margin_pct"] for p in route_performance(result, routes)]
+            values["route_margin_pct"] = [float(_value(m)) for m in margins]
+            jacobian["route_margin_pct"] = np.array([_gradient(m, n) for m in margins]).reshape(len(margins), n)
+
+        results.append({"values": values, "jacobian": jacobian})
+    return results
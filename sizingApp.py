@@ -1,7 +1,6 @@
 import streamlit as st
 from geopy.geocoders import Nominatim
 from geopy.distance import geodesic
-import aerosandbox as asb
 import aerosandbox.numpy as np
 import folium
 from streamlit_folium import st_folium
@@ -13,6 +12,13 @@ import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 from geopy.exc import GeocoderTimedOut
 import time
+import os
+from sizing_model import FUEL_ENERGY_DENSITY_MJ_KG, MAX_PRACTICAL_RATIO, route_performance, size_aircraft
+from pareto_search import run_nsga2
+from surrogate import ERROR_NEIGHBOURS, SURROGATE_PATH, Surrogate, instant_sizing
+from routing import airports_with_routes, graph_for_design
+from sensitivity import INPUTS as SENSITIVITY_INPUTS, sizing_jacobians
+from scenario_store import DEFAULT_DB_PATH, ScenarioStore
 
 st.set_page_config(page_title="Electric Airplane Sizing Tool", layout="wide")
 
@@ -97,48 +103,125 @@ COMMON_AIRPORTS = {
     "DXB": (25.2528, 55.3644, "Dubai"),
 }
 
-geolocator = Nominatim(user_agent="electric_airplane_sizer_final", timeout=5)
+# NOMINATIM_DOMAIN / NOMINATIM_SCHEME point geocoding at another server (e.g. the load-test stand-in)
+geolocator = Nominatim(
+    user_agent="electric_airplane_sizer_final",
+    timeout=5,
+    domain=os.environ.get("NOMINATIM_DOMAIN", "nominatim.openstreetmap.org"),
+    scheme=os.environ.get("NOMINATIM_SCHEME", "https")
+)
 
 # Default routes: Bengaluru hub with 500 km radius destinations
+DEFAULT_ROUTES = [
+    {
+        "origin_name": "Bengaluru",
+        "origin_lat": 13.1939,
+        "origin_lon": 77.7064,
+        "dest_name": "Kochi",
+        "dest_lat": 10.1924,
+        "dest_lon": 76.2597,
+        "dist_km": 350
+    },
+    {
+        "origin_name": "Bengaluru",
+        "origin_lat": 13.1939,
+        "origin_lon": 77.7064,
+        "dest_name": "Coimbatore",
+        "dest_lat": 11.0026,
+        "dest_lon": 76.6955,
+        "dist_km": 270
+    },
+    {
+        "origin_name": "Bengaluru",
+        "origin_lat": 13.1939,
+        "origin_lon": 77.7064,
+        "dest_name": "Chennai",
+        "dest_lat": 12.9896,
+        "dest_lon": 80.1693,
+        "dist_km": 340
+    },
+    {
+        "origin_name": "Bengaluru",
+        "origin_lat": 13.1939,
+        "origin_lon": 77.7064,
+        "dest_name": "Hyderabad",
+        "dest_lat": 17.3850,
+        "dest_lon": 78.4867,
+        "dist_km": 560
+    }
+]
+
 if "routes" not in st.session_state:
-    st.session_state.routes = [
-        {
-            "origin_name": "Bengaluru",
-            "origin_lat": 13.1939,
-            "origin_lon": 77.7064,
-            "dest_name": "Kochi",
-            "dest_lat": 10.1924,
-            "dest_lon": 76.2597,
-            "dist_km": 350
-        },
-        {
-            "origin_name": "Bengaluru",
-            "origin_lat": 13.1939,
-            "origin_lon": 77.7064,
-            "dest_name": "Coimbatore",
-            "dest_lat": 11.0026,
-            "dest_lon": 76.6955,
-            "dist_km": 270
-        },
-        {
-            "origin_name": "Bengaluru",
-            "origin_lat": 13.1939,
-            "origin_lon": 77.7064,
-            "dest_name": "Chennai",
-            "dest_lat": 12.9896,
-            "dest_lon": 80.1693,
-            "dist_km": 340
-        },
-        {
-            "origin_name": "Bengaluru",
-            "origin_lat": 13.1939,
-            "origin_lon": 77.7064,
-            "dest_name": "Hyderabad",
-            "dest_lat": 17.3850,
-            "dest_lon": 78.4867,
-            "dist_km": 560
-        }
-    ]
+    st.session_state.routes = [dict(r) for r in DEFAULT_ROUTES]
+
+# Configuration widget ranges and defaults, by size_aircraft input: (min, max, default).
+# Each widget keeps its value in session state under "cfg_<input>", so a loaded
+# scenario can set them before they are drawn.
+CONFIG_LIMITS = {
+    "cruise_speed_kmh": (150, 400, 200),
+    "cruise_altitude_ft": (3000, 16000, 6000),
+    "battery_density": (200, 600, 240),
+    "efficiency": (0.70, 0.95, 0.85),
+    "peak_to_cruise_ratio": (1.5, 3.0, 1.8),
+    "desired_charge_time_h": (0.3, 4.0, 1.5),
+    "parasite_cd0": (0.015, 0.040, 0.022),
+    "empty_base_kg": (500, 4000, 900),
+    "pass_weight_kg": (80, 120, 100),
+    "turboprop_cruise_fraction": (50, 90, 75),
+    "cruise_fuel_consumption_kgh": (10, 50, 25),
+}
+
+# Passenger and cargo limits per aircraft mode, kept under "cfg_<mode>_<input>" (None: no passengers)
+MODE_PAYLOAD_LIMITS = {
+    "Passenger": {"num_pass": (1, 20, 4), "cargo_kg": (0, 1000, 50)},
+    "Cargo-only": {"num_pass": None, "cargo_kg": (0, 3000, 500)},
+    "Mixed": {"num_pass": (0, 20, 3), "cargo_kg": (0, 2000, 100)},
+    "Hybrid (2E + 2TP)": {"num_pass": (1, 20, 4), "cargo_kg": (0, 1000, 50)},
+}
+
+def _clamp(value, limits):
+    low, high, _ = limits
+    return type(low)(min(max(value, low), high))
+
+def set_config_inputs(inputs):
+    """Set the configuration widgets from saved size_aircraft inputs, clamped to the widget ranges."""
+    num_pass = inputs.get("num_pass", 0)
+    cargo_kg = inputs.get("cargo_kg", 0)
+    if inputs.get("is_hybrid"):
+        mode = "Hybrid (2E + 2TP)"
+    elif num_pass == 0:
+        mode = "Cargo-only"
+    elif cargo_kg <= MODE_PAYLOAD_LIMITS["Passenger"]["cargo_kg"][1]:
+        mode = "Passenger"
+    else:
+        mode = "Mixed"
+    st.session_state.cfg_mode = mode
+    for name, limits in MODE_PAYLOAD_LIMITS[mode].items():
+        if limits:
+            st.session_state[f"cfg_{mode}_{name}"] = _clamp(inputs.get(name, limits[2]), limits)
+    for name, limits in CONFIG_LIMITS.items():
+        st.session_state[f"cfg_{name}"] = _clamp(inputs.get(name, limits[2]), limits)
+
+# Scenario inputs are applied on the run after loading, before any widget is created
+if "pending_config_inputs" in st.session_state:
+    set_config_inputs(st.session_state.pop("pending_config_inputs"))
+st.session_state.setdefault("cfg_mode", "Passenger")
+for _mode, _payload in MODE_PAYLOAD_LIMITS.items():
+    for _name, _limits in _payload.items():
+        if _limits:
+            st.session_state.setdefault(f"cfg_{_mode}_{_name}", _limits[2])
+for _name, _limits in CONFIG_LIMITS.items():
+    st.session_state.setdefault(f"cfg_{_name}", _limits[2])
+
+@st.cache_resource
+def get_scenario_store():
+    return ScenarioStore(DEFAULT_DB_PATH)
+
+@st.cache_resource
+def load_surrogate():
+    if not os.path.exists(SURROGATE_PATH):
+        return None
+    return Surrogate.load(SURROGATE_PATH)
 
 @cache_data
 def search_locations(query: str):
@@ -344,450 +427,720 @@ if st.session_state.routes:
     with config_col:
         st.markdown("### Aircraft Configuration")
         
-        mode = st.radio("**Aircraft Mode**", ["Passenger", "Cargo-only", "Mixed", "Hybrid (2E + 2TP)"])
+        mode = st.radio("**Aircraft Mode**", list(MODE_PAYLOAD_LIMITS), key="cfg_mode")
 
-        if mode == "Passenger":
-            num_pass = st.number_input("👥 Passengers", 1, 20, 4)
-            cargo_kg = st.number_input("📦 Cargo (kg)", 0, 1000, 50)
-            is_hybrid = False
-        elif mode == "Cargo-only":
+        payload_limits = MODE_PAYLOAD_LIMITS[mode]
+        if payload_limits["num_pass"]:
+            num_pass = st.number_input("👥 Passengers", *payload_limits["num_pass"][:2], key=f"cfg_{mode}_num_pass")
+        else:  # Cargo-only
             num_pass = 0
-            cargo_kg = st.number_input("📦 Cargo (kg)", 0, 3000, 500)
-            is_hybrid = False
-        elif mode == "Mixed":
-            num_pass = st.number_input("👥 Passengers", 0, 20, 3)
-            cargo_kg = st.number_input("📦 Cargo (kg)", 0, 2000, 100)
-            is_hybrid = False
-        else:  # Hybrid
-            num_pass = st.number_input("👥 Passengers", 1, 20, 4)
-            cargo_kg = st.number_input("📦 Cargo (kg)", 0, 1000, 50)
-            is_hybrid = True
+        cargo_kg = st.number_input("📦 Cargo (kg)", *payload_limits["cargo_kg"][:2], key=f"cfg_{mode}_cargo_kg")
+        is_hybrid = mode == "Hybrid (2E + 2TP)"
         
         st.markdown("---")
         st.markdown("**Performance**")
-        cruise_speed_kmh = st.slider("⚡ Cruise Speed (km/h)", 150, 400, 200)
-        cruise_altitude_ft = st.slider("📊 Altitude (ft)", 3000, 16000, 6000, 500)
-        cruise_altitude_m = cruise_altitude_ft * 0.3048  # Convert feet to meters
+        cruise_speed_kmh = st.slider("⚡ Cruise Speed (km/h)", 150, 400, key="cfg_cruise_speed_kmh")
+        cruise_altitude_ft = st.slider("📊 Altitude (ft)", 3000, 16000, step=500, key="cfg_cruise_altitude_ft")
         
         st.markdown("---")
         st.markdown("**Power & Energy**")
-        battery_density = st.slider("🔋 Battery Density (Wh/kg)", 200, 600, 240)
-        efficiency = st.slider("⚙️ Efficiency", 0.70, 0.95, 0.85, 0.01)
-        peak_to_cruise_ratio = st.slider("📈 Peak/Cruise Ratio", 1.5, 3.0, 1.8, 0.1)
-        desired_charge_time_h = st.slider("⏱️ Charge Time (h)", 0.3, 4.0, 1.5, 0.1)
+        battery_density = st.slider("🔋 Battery Density (Wh/kg)", 200, 600, key="cfg_battery_density")
+        efficiency = st.slider("⚙️ Efficiency", 0.70, 0.95, step=0.01, key="cfg_efficiency")
+        peak_to_cruise_ratio = st.slider("📈 Peak/Cruise Ratio", 1.5, 3.0, step=0.1, key="cfg_peak_to_cruise_ratio")
+        desired_charge_time_h = st.slider("⏱️ Charge Time (h)", 0.3, 4.0, step=0.1, key="cfg_desired_charge_time_h")
         
         st.markdown("---")
         st.markdown("**Aerodynamics & Weight**")
-        parasite_cd0 = st.slider("🌪️ Parasite CD₀", 0.015, 0.040, 0.022, 0.001)
-        empty_base_kg = st.number_input("⚖️ Empty Weight (kg)", 500, 4000, 900)
-        pass_weight_kg = st.number_input("👤 Per Passenger (kg)", 80, 120, 100)
+        parasite_cd0 = st.slider("🌪️ Parasite CD₀", 0.015, 0.040, step=0.001, key="cfg_parasite_cd0")
+        empty_base_kg = st.number_input("⚖️ Empty Weight (kg)", 500, 4000, key="cfg_empty_base_kg")
+        pass_weight_kg = st.number_input("👤 Per Passenger (kg)", 80, 120, key="cfg_pass_weight_kg")
         
         # Hybrid-specific parameters
         if is_hybrid:
             st.markdown("---")
             st.markdown("**Hybrid Powertrain**")
             st.info("⚡ 2 Electric motors for takeoff/climb | 🔥 2 Turboprops for efficient cruise")
-            turboprop_cruise_fraction = st.slider("🔥 Turboprop Power % (Cruise)", 50, 90, 75)
-            cruise_fuel_consumption_kgh = st.slider("⛽ Fuel Consumption (kg/h at cruise)", 10, 50, 25)
-            fuel_energy_density_mj_kg = 43.0  # Jet fuel
+            turboprop_cruise_fraction = st.slider("🔥 Turboprop Power % (Cruise)", 50, 90, key="cfg_turboprop_cruise_fraction")
+            cruise_fuel_consumption_kgh = st.slider("⛽ Fuel Consumption (kg/h at cruise)", 10, 50, key="cfg_cruise_fuel_consumption_kgh")
+
+        sizing_inputs = {
+            "max_dist_km": max_dist_km,
+            "num_pass": num_pass,
+            "cargo_kg": cargo_kg,
+            "is_hybrid": is_hybrid,
+            "cruise_speed_kmh": cruise_speed_kmh,
+            "cruise_altitude_ft": cruise_altitude_ft,
+            "battery_density": battery_density,
+            "efficiency": efficiency,
+            "peak_to_cruise_ratio": peak_to_cruise_ratio,
+            "desired_charge_time_h": desired_charge_time_h,
+            "parasite_cd0": parasite_cd0,
+            "empty_base_kg": empty_base_kg,
+            "pass_weight_kg": pass_weight_kg,
+        }
+        if is_hybrid:
+            sizing_inputs["turboprop_cruise_fraction"] = turboprop_cruise_fraction
+            sizing_inputs["cruise_fuel_consumption_kgh"] = cruise_fuel_consumption_kgh
+
+        # Instant estimate from the trained surrogate (falls back to the full model outside its range)
+        estimate = instant_sizing(load_surrogate(), sizing_inputs)
+        est_err = estimate["error"]
+        st.markdown("---")
+        st.markdown("**⚡ Instant Estimate**")
+        est_col1, est_col2, est_col3 = st.columns(3)
+        with est_col1:
+            st.metric("⚖️ MTOW", f"{estimate['total_mass_kg']:.0f} kg", f"typ. ±{est_err['total_mass_kg']*100:.0f}%", delta_color="off")
+        with est_col2:
+            st.metric("🔋 Battery", f"{estimate['battery_kwh']:.0f} kWh", f"typ. ±{est_err['battery_kwh']*100:.0f}%", delta_color="off")
+        with est_col3:
+            st.metric("🔌 Charger", f"{estimate['charger_kw']:.0f} kW", f"typ. ±{est_err['charger_kw']*100:.0f}%", delta_color="off")
+        if estimate["source"] == "surrogate":
+            st.caption(f"Surrogate estimate. ± is the typical error for similar designs (the largest among the {ERROR_NEIGHBOURS} nearest validation designs), not a bound. Press Calculate for the full sizing.")
+        else:
+            st.caption("Outside the surrogate's trained range - computed with the full sizing model.")
 else:
     max_dist_km = 0
     st.info("👈 Add routes above to get started")
 
-# Updated Calculate Optimal Sizing block (heuristic approach - no optimization)
-if max_dist_km > 0 and st.button("🚀 Calculate Aircraft Sizing", use_container_width=True):
-    with st.spinner("⏳ Computing sizing..."):
-        distance_m = max_dist_km * 1000
-        v_cruise_ms = cruise_speed_kmh / 3.6
-        payload_kg = num_pass * pass_weight_kg + cargo_kg
-        parachute_mass_kg = 60
-
-        # Heuristic sizing (no CasADi optimization - avoids solver issues)
-        atm = asb.Atmosphere(altitude=cruise_altitude_m)
-        rho = float(atm.density())
-
-        # Step 1: Estimate cruise power
-        # Power = (Drag × Velocity) / Efficiency
-        # For a given wing area and weight, CL = Weight / (0.5 * rho * v^2 * S)
-        # Start with a reasonable estimate of wing area
-        
-        wing_area_guess = 12 + payload_kg / 25  # m² - empirical formula
-        total_mass_guess = empty_base_kg + payload_kg + parachute_mass_kg + 200  # +200 kg for battery guess
-        weight_n = total_mass_guess * 9.81
-        
-        # CL at cruise
-        cl_cruise = weight_n / (0.5 * rho * v_cruise_ms**2 * wing_area_guess)
-        cl_cruise = np.clip(cl_cruise, 0.25, 1.3)
-        
-        # Induced drag coefficient
-        oswald_e = 0.82
-        ar_guess = 12
-        cd_induced = (cl_cruise**2) / (np.pi * ar_guess * oswald_e)
-        cd_total = cd_induced + parasite_cd0 + 0.003
-        
-        # Drag and power
-        drag_n = cd_total * 0.5 * rho * v_cruise_ms**2 * wing_area_guess
-        p_mech_cruise_w = drag_n * v_cruise_ms
-        p_elec_cruise_w = p_mech_cruise_w / efficiency
-        
-        # Energy budgets - top level calculation
-        e_cruise_j = p_elec_cruise_w * (distance_m / v_cruise_ms)
-        e_pot_j = total_mass_guess * 9.81 * cruise_altitude_m
-        e_climb_j = e_pot_j * 2.2 / efficiency
-        e_descent_j = e_pot_j * 0.3 / efficiency  # ~30% of climb energy
-        e_taxi_j = 8e3 * 3600  # ~8 kWh for taxi
-        e_fixed_j = 20e3 * 3600
-        
-        e_mission_j = e_cruise_j + e_climb_j + e_descent_j + e_taxi_j + e_fixed_j
-        e_required_j = e_mission_j * 1.4  # 40% margin
-        e_gross_j = e_required_j / 0.85  # Usable fraction 85%
-        
-        battery_kwh = e_gross_j / 3.6e6
-        battery_mass_kg = (battery_kwh * 1000) / battery_density
-        
-        # Step 2: Refine total mass and wing area iteratively
-        for iteration in range(3):
-            # For hybrid: account for fuel tank mass
-            fuel_mass_kg = 0
-            if is_hybrid:
-                # Estimate fuel needed for cruise on longest leg
-                cruise_time_h = distance_m / v_cruise_ms / 3600
-                turboprop_power_w = p_elec_cruise_w * (turboprop_cruise_fraction / (100 - turboprop_cruise_fraction))
-                fuel_needed_kg = cruise_fuel_consumption_kgh * cruise_time_h * 1.3  # 30% reserve
-                fuel_mass_kg = fuel_needed_kg
-                # Add fuel tank structure (typically 10-15% of fuel mass)
-                fuel_tank_mass_kg = fuel_mass_kg * 0.12
-            else:
-                fuel_mass_kg = 0
-                fuel_tank_mass_kg = 0
-            
-            total_mass_kg = empty_base_kg + payload_kg + battery_mass_kg + parachute_mass_kg + fuel_mass_kg + fuel_tank_mass_kg
-            weight_n = total_mass_kg * 9.81
-            
-            # Adjust wing area to maintain reasonable CL
-            target_cl = 0.6  # Optimal cruise CL range
-            wing_area = weight_n / (0.5 * rho * target_cl * v_cruise_ms**2)
-            wing_area = np.clip(wing_area, 10, 75)
-            
-            # Recalculate power and energy
-            cl_new = weight_n / (0.5 * rho * v_cruise_ms**2 * wing_area)
-            cd_induced_new = (cl_new**2) / (np.pi * ar_guess * oswald_e)
-            cd_total_new = cd_induced_new + parasite_cd0 + 0.003
-            
-            drag_n = cd_total_new * 0.5 * rho * v_cruise_ms**2 * wing_area
-            p_mech_cruise_w = drag_n * v_cruise_ms
-            p_elec_cruise_w = p_mech_cruise_w / efficiency
-            
-            e_cruise_j = p_elec_cruise_w * (distance_m / v_cruise_ms)
-            e_climb_j = (total_mass_kg * 9.81 * cruise_altitude_m) * 2.2 / efficiency
-            
-            # Add descent and taxi energy
-            e_descent_j = (total_mass_kg * 9.81 * cruise_altitude_m) * 0.3 / efficiency  # ~30% of climb energy
-            e_taxi_j = 8e3 * 3600  # ~8 kWh for taxi (pre and post flight)
-            
-            e_mission_j = e_cruise_j + e_climb_j + e_descent_j + e_taxi_j + e_fixed_j
-            
-            if is_hybrid:
-                # For hybrid: electric covers climb + taxi + descent + reserve
-                # Turboprops cover cruise (75% power)
-                e_electric_mission_j = e_climb_j + e_descent_j + e_taxi_j + e_fixed_j
-                e_required_j = e_electric_mission_j * 1.4
-            else:
-                e_required_j = e_mission_j * 1.4
-            
-            e_gross_j = e_required_j / 0.85
-            
-            battery_kwh = e_gross_j / 3.6e6
-            battery_mass_kg = (battery_kwh * 1000) / battery_density
-        
-        # Final calculations
-        total_mass_kg = empty_base_kg + payload_kg + battery_mass_kg + parachute_mass_kg
+SENSITIVITY_LABELS = {
+    "max_dist_km": "📏 Longest Leg",
+    "num_pass": "👥 Passengers",
+    "cargo_kg": "📦 Cargo",
+    "cruise_speed_kmh": "⚡ Cruise Speed",
+    "cruise_altitude_ft": "📊 Altitude",
+    "battery_density": "🔋 Battery Density",
+    "efficiency": "⚙️ Efficiency",
+    "peak_to_cruise_ratio": "📈 Peak/Cruise Ratio",
+    "desired_charge_time_h": "⏱️ Charge Time",
+    "parasite_cd0": "🌪️ Parasite CD₀",
+    "empty_base_kg": "⚖️ Empty Weight",
+    "pass_weight_kg": "👤 Per Passenger",
+    "turboprop_cruise_fraction": "🔥 Turboprop Power %",
+    "cruise_fuel_consumption_kgh": "⛽ Fuel Consumption",
+    "ar_guess": "🪟 Aspect Ratio",
+    "target_cl": "🎯 Target CL",
+    "parachute_mass_kg": "🪂 Parachute Mass",
+}
+
+
+def tornado_figure(res, routes, swing=0.1):
+    """Tornado chart of each output's change for a ±``swing`` change in every input, from the analytic Jacobian."""
+    point = {name: res[name] for name in SENSITIVITY_INPUTS}
+    point["is_hybrid"] = res["is_hybrid"]
+    sens = sizing_jacobians([point], routes)[0]
+    input_values = np.array([res[name] for name in SENSITIVITY_INPUTS], dtype=float)
+
+    outputs = [
+        ("⚖️ MTOW (kg)", sens["values"]["total_mass_kg"], sens["jacobian"]["total_mass_kg"]),
+        ("🔋 Battery (kWh)", sens["values"]["battery_kwh"], sens["jacobian"]["battery_kwh"]),
+        ("🪟 Wing Area (m²)", sens["values"]["wing_area"], sens["jacobian"]["wing_area"]),
+        ("📊 L/D", sens["values"]["ld_final"], sens["jacobian"]["ld_final"]),
+        ("🔌 Charger (kW)", sens["values"]["charger_kw"], sens["jacobian"]["charger_kw"]),
+    ]
+    for route, margin, grad in zip(routes, sens["values"]["route_margin_pct"], sens["jacobian"]["route_margin_pct"]):
+        outputs.append((f"📋 Margin % {route['origin_name']} → {route['dest_name']}", margin, grad))
+
+    fig = go.Figure()
+    for k, (label, value, grad) in enumerate(outputs):
+        delta = grad * input_values * swing
+        order = [i for i in np.argsort(np.abs(delta)) if abs(delta[i]) > 1e-9 * max(abs(value), 1)][-10:]
+        names = [SENSITIVITY_LABELS[SENSITIVITY_INPUTS[i]] for i in order]
+        for sign, bar_name, color in [(-1, f"-{swing:.0%} input", "#45B7D1"), (1, f"+{swing:.0%} input", "#FF6B6B")]:
+            fig.add_trace(go.Bar(
+                y=names,
+                x=[sign * delta[i] for i in order],
+                base=value,
+                orientation="h",
+                name=bar_name,
+                marker_color=color,
+                visible=(k == 0),
+                hovertemplate="<b>%{y}</b><br>" + label + ": %{x:+.3g}<extra></extra>"
+            ))
+
+    fig.update_layout(
+        height=450,
+        barmode="overlay",
+        showlegend=True,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12),
+        updatemenus=[dict(
+            x=0,
+            y=1.15,
+            xanchor="left",
+            buttons=[
+                dict(
+                    label=label,
+                    method="update",
+                    args=[{"visible": [j // 2 == k for j in range(2 * len(outputs))]}]
+                )
+                for k, (label, _, _) in enumerate(outputs)
+            ]
+        )]
+    )
+    return fig
+
+
+def render_sizing_results(res, routes, key_prefix="results"):
+    """Render the full results page for one sizing result from ``size_aircraft``.
+
+    ``key_prefix`` keeps element IDs unique when several results share a page.
+    """
+    max_dist_km = res["max_dist_km"]
+    num_pass = res["num_pass"]
+    cargo_kg = res["cargo_kg"]
+    is_hybrid = res["is_hybrid"]
+    cruise_speed_kmh = res["cruise_speed_kmh"]
+    desired_charge_time_h = res["desired_charge_time_h"]
+    turboprop_cruise_fraction = res["turboprop_cruise_fraction"]
+    cruise_fuel_consumption_kgh = res["cruise_fuel_consumption_kgh"]
+    fuel_energy_density_mj_kg = FUEL_ENERGY_DENSITY_MJ_KG
+    ar_guess = res["ar_guess"]
+    parachute_mass_kg = res["parachute_mass_kg"]
+    empty_base_kg = res["empty_base_kg"]
+    payload_kg = res["payload_kg"]
+    total_mass_kg = res["total_mass_kg"]
+    battery_kwh = res["battery_kwh"]
+    battery_mass_kg = res["battery_mass_kg"]
+    fuel_tank_mass_kg = res["fuel_tank_mass_kg"]
+    wing_area = res["wing_area"]
+    ld_final = res["ld_final"]
+    p_elec_cruise_w = res["p_elec_cruise_w"]
+    p_peak_kw = res["p_peak_kw"]
+    motor_power_kw = res["motor_power_kw"]
+    v_max_kmh = res["v_max_kmh"]
+    charger_kw = res["charger_kw"]
+    e_taxi_j = res["e_taxi_j"]
+    e_climb_j = res["e_climb_j"]
+    e_cruise_j = res["e_cruise_j"]
+    e_descent_j = res["e_descent_j"]
+    electric_only_range_km = res["electric_only_range_km"]
+    electric_cruise_power_kw = res["electric_cruise_power_kw"]
+    turboprop_cruise_power_kw = res["turboprop_cruise_power_kw"]
+    cruise_time_h = res["cruise_time_h"]
+    total_fuel_capacity_kg = res["total_fuel_capacity_kg"]
+    fuel_only_range_km = res["fuel_only_range_km"]
+    total_extended_range_km = res["total_extended_range_km"]
+    battery_to_power_ratio_wh_kw = res["battery_to_power_ratio_wh_kw"]
+    battery_feasible = res["battery_feasible"]
+    route_perf = route_performance(res, routes)
+
+    travel_time_hours = res["travel_time_hours"]
+    travel_time_minutes = int((travel_time_hours % 1) * 60)
+    travel_time_hours_int = int(travel_time_hours)
+
+    max_practical_ratio = MAX_PRACTICAL_RATIO
+    battery_status = "✅ Feasible" if battery_feasible else "❌ Battery Too Large"
+    battery_warning = "" if battery_feasible else f" (Ratio: {battery_to_power_ratio_wh_kw:.0f} Wh/kW, exceeds {max_practical_ratio} Wh/kW limit)"
+    
+    if not battery_feasible:
+        st.warning(f"⚠️ **Battery Infeasible**: {battery_kwh:.0f} kWh for {p_peak_kw:.0f} kW peak power would be too large to fit in aircraft.{battery_warning}")
+
+    # Display results in attractive format
+    st.markdown('<h3 class="section-header">✈️ Aircraft Sizing Results</h3>', unsafe_allow_html=True)
+
+    payload_desc = f"{num_pass} passengers + {cargo_kg} kg cargo" if cargo_kg else f"{num_pass} passengers"
+    if num_pass == 0:
+        payload_desc = f"{cargo_kg} kg cargo (cargo-only)"
+
+    # Create result columns
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown(f'<div class="metric-card"><strong>👥 Payload:</strong> {payload_desc}</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-card"><strong>⚖️ MTOW:</strong> {total_mass_kg:.0f} kg</div>', unsafe_allow_html=True)
+        battery_card_color = "background-color: #ffe6e6;" if not battery_feasible else "background-color: #f0f2f6;"
+        st.markdown(f'<div class="metric-card" style="{battery_card_color}"><strong>🔋 Battery:</strong> {battery_kwh:.0f} kWh ({battery_mass_kg:.0f} kg) {battery_status}</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-card"><strong>🪟 Wing Area:</strong> {wing_area:.1f} m² (AR {ar_guess:.1f})</div>', unsafe_allow_html=True)
         if is_hybrid:
-            total_mass_kg += fuel_mass_kg + fuel_tank_mass_kg
-        
-        weight_n = total_mass_kg * 9.81
-        cl_final = weight_n / (0.5 * rho * v_cruise_ms**2 * wing_area)
-        cd_induced_final = (cl_final**2) / (np.pi * ar_guess * oswald_e)
-        cd_final = cd_induced_final + parasite_cd0 + 0.003
-        ld_final = cl_final / cd_final
-        
-        p_peak_kw = (p_elec_cruise_w / 1000) * peak_to_cruise_ratio
-        motor_power_kw = round(p_peak_kw / 4)
-        v_max_kmh = cruise_speed_kmh * (peak_to_cruise_ratio ** (1/3))
-        charger_kw = (battery_kwh * 0.8) / desired_charge_time_h
-        
-        # Calculate travel time (cruise only, excludes climb and descent)
-        travel_time_hours = max_dist_km / cruise_speed_kmh
-        travel_time_minutes = int((travel_time_hours % 1) * 60)
-        travel_time_hours_int = int(travel_time_hours)
-        
-        # Hybrid-specific calculations
+            st.markdown(f'<div class="metric-card"><strong>⛽ Fuel Capacity:</strong> {total_fuel_capacity_kg:.0f} kg ({total_fuel_capacity_kg/0.8:.0f} L)</div>', unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f'<div class="metric-card"><strong>📊 L/D Ratio:</strong> {ld_final:.2f}</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-card"><strong>⚡ Cruise Power:</strong> {p_elec_cruise_w/1000:.0f} kW</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-card"><strong>🚀 Peak Power:</strong> {p_peak_kw:.0f} kW (4 × {motor_power_kw} kW)</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="metric-card"><strong>💨 Max Speed:</strong> {v_max_kmh:.0f} km/h</div>', unsafe_allow_html=True)
         if is_hybrid:
-            # Cruise power split: electric + turboprop
-            electric_cruise_power_kw = p_elec_cruise_w / 1000 * (100 - turboprop_cruise_fraction) / 100
-            turboprop_cruise_power_kw = p_elec_cruise_w / 1000 * turboprop_cruise_fraction / 100
-            
-            # Fuel needed for cruise on longest leg
-            cruise_time_h = max_dist_km / cruise_speed_kmh
-            fuel_for_cruise_kg = cruise_fuel_consumption_kgh * cruise_time_h
-            fuel_reserve_kg = fuel_for_cruise_kg * 0.3  # 30% reserve
-            total_fuel_capacity_kg = fuel_for_cruise_kg + fuel_reserve_kg
-            
-            # Calculate electric-only range with battery
-            electric_only_range_km = (battery_kwh * 3600 / (p_elec_cruise_w / 1000)) * (cruise_speed_kmh / 3.6) / 1000 if p_elec_cruise_w > 0 else 0
-            
-            # Calculate fuel-only range with turboprops
-            fuel_energy_j = total_fuel_capacity_kg * fuel_energy_density_mj_kg * 1e6  # Convert MJ to J
-            turboprop_efficiency = 0.78
-            fuel_mechanical_energy_j = fuel_energy_j * turboprop_efficiency
-            turboprop_mechanical_power_w = (turboprop_cruise_power_kw * 1000) / efficiency  # Convert to mech power
-            fuel_only_time_h = fuel_mechanical_energy_j / (turboprop_mechanical_power_w * 3600)
-            fuel_only_range_km = fuel_only_time_h * cruise_speed_kmh
-            
-            # Total range: can fly on electric until battery low, then switch to turboprops
-            total_extended_range_km = electric_only_range_km + fuel_only_range_km
-        
-        # Check battery feasibility (physical size constraint)
-        battery_to_power_ratio_wh_kw = (battery_kwh * 1000) / p_peak_kw if p_peak_kw > 0 else 0
-        max_practical_ratio = 800  # Wh/kW - anything higher is physically too large
-        battery_feasible = battery_to_power_ratio_wh_kw <= max_practical_ratio
-        battery_status = "✅ Feasible" if battery_feasible else "❌ Battery Too Large"
-        battery_warning = "" if battery_feasible else f" (Ratio: {battery_to_power_ratio_wh_kw:.0f} Wh/kW, exceeds {max_practical_ratio} Wh/kW limit)"
-        
-        if not battery_feasible:
-            st.warning(f"⚠️ **Battery Infeasible**: {battery_kwh:.0f} kWh for {p_peak_kw:.0f} kW peak power would be too large to fit in aircraft.{battery_warning}")
-        
-        # Display results in attractive format
-        st.markdown('<h3 class="section-header">✈️ Aircraft Sizing Results</h3>', unsafe_allow_html=True)
-        
-        payload_desc = f"{num_pass} passengers + {cargo_kg} kg cargo" if cargo_kg else f"{num_pass} passengers"
-        if num_pass == 0:
-            payload_desc = f"{cargo_kg} kg cargo (cargo-only)"
-        
-        # Create result columns
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown(f'<div class="metric-card"><strong>👥 Payload:</strong> {payload_desc}</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="metric-card"><strong>⚖️ MTOW:</strong> {total_mass_kg:.0f} kg</div>', unsafe_allow_html=True)
-            battery_card_color = "background-color: #ffe6e6;" if not battery_feasible else "background-color: #f0f2f6;"
-            st.markdown(f'<div class="metric-card" style="{battery_card_color}"><strong>🔋 Battery:</strong> {battery_kwh:.0f} kWh ({battery_mass_kg:.0f} kg) {battery_status}</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="metric-card"><strong>🪟 Wing Area:</strong> {wing_area:.1f} m² (AR {ar_guess:.1f})</div>', unsafe_allow_html=True)
-            if is_hybrid:
-                st.markdown(f'<div class="metric-card"><strong>⛽ Fuel Capacity:</strong> {total_fuel_capacity_kg:.0f} kg ({total_fuel_capacity_kg/0.8:.0f} L)</div>', unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown(f'<div class="metric-card"><strong>📊 L/D Ratio:</strong> {ld_final:.2f}</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="metric-card"><strong>⚡ Cruise Power:</strong> {p_elec_cruise_w/1000:.0f} kW</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="metric-card"><strong>🚀 Peak Power:</strong> {p_peak_kw:.0f} kW (4 × {motor_power_kw} kW)</div>', unsafe_allow_html=True)
-            st.markdown(f'<div class="metric-card"><strong>💨 Max Speed:</strong> {v_max_kmh:.0f} km/h</div>', unsafe_allow_html=True)
-            if is_hybrid:
-                st.markdown(f'<div class="metric-card"><strong>🚀 Turboprop Power:</strong> {turboprop_cruise_power_kw:.0f} kW @ cruise</div>', unsafe_allow_html=True)
-        
+            st.markdown(f'<div class="metric-card"><strong>🚀 Turboprop Power:</strong> {turboprop_cruise_power_kw:.0f} kW @ cruise</div>', unsafe_allow_html=True)
+
+    st.markdown("---")
+    st.markdown("**Route & Performance**")
+    route_col1, route_col2, route_col3, route_col4 = st.columns(4)
+    with route_col1:
+        st.metric("📏 Route Distance", f"{max_dist_km:.0f} km")
+    with route_col2:
+        st.metric("✈️ Cruise Speed", f"{cruise_speed_kmh:.0f} km/h")
+    with route_col3:
+        st.metric("⏱️ Travel Time", f"{travel_time_hours_int}h {travel_time_minutes}m")
+    with route_col4:
+        status_ratio = "✅" if battery_feasible else "❌"
+        st.metric("🔋 Battery/Power", f"{battery_to_power_ratio_wh_kw:.0f} Wh/kW {status_ratio}", "800 Wh/kW max")
+
+    st.markdown("---")
+    st.markdown("**Energy Budget**")
+
+    climb_kwh = e_climb_j / 3.6e6
+    cruise_kwh = e_cruise_j / 3.6e6
+    descent_kwh = e_descent_j / 3.6e6
+    taxi_kwh = e_taxi_j / 3.6e6
+    fixed_kwh = 20.0
+
+    energy_col1, energy_col2, energy_col3, energy_col4, energy_col5 = st.columns(5)
+    with energy_col1:
+        st.metric("Taxi", f"{taxi_kwh:.1f} kWh")
+    with energy_col2:
+        st.metric("Climb", f"{climb_kwh:.1f} kWh")
+    with energy_col3:
+        st.metric("Cruise", f"{cruise_kwh:.1f} kWh")
+    with energy_col4:
+        st.metric("Descent", f"{descent_kwh:.1f} kWh")
+    with energy_col5:
+        st.metric("Reserve", f"{fixed_kwh:.1f} kWh")
+
+    # Energy breakdown visualization
+    st.markdown("---")
+    st.markdown("**Energy Usage Breakdown**")
+
+    # Create pie chart
+    energy_stages = ['Taxi', 'Climb', 'Cruise', 'Descent', 'Reserve']
+    energy_values = [taxi_kwh, climb_kwh, cruise_kwh, descent_kwh, fixed_kwh]
+    colors = ['#FFB6B9', '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
+
+    fig = go.Figure(data=[go.Pie(
+        labels=energy_stages,
+        values=energy_values,
+        marker=dict(colors=colors),
+        textposition='inside',
+        textinfo='label+percent+value',
+        hovertemplate='<b>%{label}</b><br>Energy: %{value:.1f} kWh<br>Percentage: %{percent}<extra></extra>'
+    )])
+
+    fig.update_layout(
+        height=400,
+        showlegend=True,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12)
+    )
+
+    st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_energy_chart")
+
+    st.markdown("---")
+    st.markdown(f'<div class="metric-card"><strong>🔌 Required Charger (for {desired_charge_time_h:.1f}h to 80%):</strong> {charger_kw:.0f} kW</div>', unsafe_allow_html=True)
+
+    # Sensitivity of every output to every input (forward-mode AD, no finite-difference reruns)
+    st.markdown("---")
+    st.markdown('<h3 class="section-header">🌪️ What Drives the Design</h3>', unsafe_allow_html=True)
+    st.caption("Change in each output for a ±10% change in one input, from analytic derivatives of the sizing model. Pick the output from the menu.")
+    st.plotly_chart(tornado_figure(res, routes), use_container_width=True, key=f"{key_prefix}_tornado")
+
+    # Performance analysis for each route
+    st.markdown("---")
+    st.markdown('<h3 class="section-header">📊 Performance on Each Route</h3>', unsafe_allow_html=True)
+
+    route_rows = []
+    for perf in route_perf:
+        route = perf["route"]
+        route_time_h = int(perf["flight_time_h"])
+        route_time_m = int((perf["flight_time_h"] % 1) * 60)
+        margin = perf["margin_pct"]
+
+        route_rows.append({
+            "Route": f"{route['origin_name']} → {route['dest_name']}",
+            "Distance": f"{perf['dist_km']} km",
+            "Flight Time": f"{route_time_h}h {route_time_m}m",
+            "Mission Energy": f"{perf['mission_kwh']:.0f} kWh",
+            "Battery Capacity": f"{battery_kwh:.0f} kWh (85%: {battery_kwh*0.85:.0f})",
+            "Status": "✅" if perf["feasible"] else "⚠️",
+            "Margin": f"{margin:.0f}%" if margin >= 0 else "❌ INFEASIBLE"
+        })
+
+    # Display as table
+    import pandas as pd
+    df_routes = pd.DataFrame(route_rows)
+    st.dataframe(df_routes, use_container_width=True, hide_index=True, key=f"{key_prefix}_routes")
+
+    # Fastest itineraries over the airport network, with charging stops where a leg is out of range
+    airports, route_endpoints = airports_with_routes(COMMON_AIRPORTS, routes)
+    route_graph = graph_for_design(res, airports)
+
+    st.markdown("---")
+    st.markdown('<h3 class="section-header">🔀 Fastest Itineraries with Charging Stops</h3>', unsafe_allow_html=True)
+    st.caption(f"Max nonstop leg: {route_graph.max_leg_km:.0f} km | Charging at {charger_kw:.0f} kW")
+
+    itinerary_rows = []
+    for route, (origin_code, dest_code) in zip(routes, route_endpoints):
+        itinerary = route_graph.fastest_itinerary(origin_code, dest_code)
+        if itinerary is None:
+            path_desc, stops_desc, charge_desc, refuel_desc, total_desc = "❌ No route within range", "-", "-", "-", "-"
+        else:
+            path_desc = " → ".join(airports[code][2] for code in itinerary["stops"])
+            stops_desc = str(len(itinerary["legs"]) - 1)
+            charge_h = sum(leg["charge_h"] for leg in itinerary["legs"])
+            charge_desc = f"{int(charge_h)}h {int((charge_h % 1) * 60)}m"
+            refuel_desc = f"{int(sum(leg['refuel_h'] for leg in itinerary['legs']) * 60)} min"
+            total_desc = f"{int(itinerary['total_h'])}h {int((itinerary['total_h'] % 1) * 60)}m"
+        itinerary_rows.append({
+            "Route": f"{route['origin_name']} → {route['dest_name']}",
+            "Itinerary": path_desc,
+            "Stops": stops_desc,
+            "Charging": charge_desc,
+            **({"Refuelling": refuel_desc} if is_hybrid else {}),
+            "Total Time": total_desc
+        })
+    st.dataframe(pd.DataFrame(itinerary_rows), use_container_width=True, hide_index=True, key=f"{key_prefix}_itineraries")
+    if is_hybrid:
+        st.caption(
+            f"Hybrid legs are limited by the fuel sized for the longest route ({route_graph.max_leg_km:.0f} km). "
+            f"Each stop recharges only the electric taxi, climb and descent ({min(route_graph.fixed_leg_kwh, route_graph.max_charge_kwh):.0f} kWh, "
+            f"{route_graph.charge_time_h(0) * 60:.0f} min at {charger_kw:.0f} kW) and refuels ({route_graph.refuel_h * 60:.0f} min). "
+            "The battery margins above assume electric-only flight, while hybrids cruise on the turboprops."
+        )
+    elif all(itinerary and len(itinerary["legs"]) == 1 for itinerary in (route_graph.fastest_itinerary(o, d) for o, d in route_endpoints)):
+        st.caption("The battery is sized for your longest route, so every route above flies nonstop. Plan longer trips through charging stops below.")
+
+    # Any origin/destination over the airport network
+    st.markdown("**🗺️ Plan Any Trip**")
+    airport_codes = sorted(airports)
+    default_origin, default_dest = route_endpoints[0] if route_endpoints else (airport_codes[0], airport_codes[1])
+    trip_col1, trip_col2 = st.columns(2)
+    with trip_col1:
+        trip_origin = st.selectbox(
+            "🛫 From", airport_codes, index=airport_codes.index(default_origin),
+            format_func=lambda code: f"{code} — {airports[code][2]}", key=f"{key_prefix}_trip_origin"
+        )
+    with trip_col2:
+        trip_dest = st.selectbox(
+            "🛬 To", airport_codes, index=airport_codes.index(default_dest),
+            format_func=lambda code: f"{code} — {airports[code][2]}", key=f"{key_prefix}_trip_dest"
+        )
+
+    trip = route_graph.fastest_itinerary(trip_origin, trip_dest) if trip_origin != trip_dest else None
+    if trip_origin == trip_dest:
+        st.info("Pick two different airports")
+    elif trip is None:
+        st.warning(f"❌ No chain of legs under {route_graph.max_leg_km:.0f} km connects these airports")
+    else:
+        trip_charge_h = sum(leg["charge_h"] for leg in trip["legs"])
+        trip_dist_km = sum(leg["dist_km"] for leg in trip["legs"])
+        trip_col1, trip_col2, trip_col3, trip_col4 = st.columns(4)
+        with trip_col1:
+            st.metric("⏱️ Total Time", f"{int(trip['total_h'])}h {int((trip['total_h'] % 1) * 60)}m")
+        with trip_col2:
+            st.metric("🛬 Charging Stops", len(trip["legs"]) - 1)
+        with trip_col3:
+            st.metric("🔌 Charging", f"{int(trip_charge_h)}h {int((trip_charge_h % 1) * 60)}m")
+        with trip_col4:
+            st.metric("📏 Distance", f"{trip_dist_km:.0f} km")
+        st.dataframe(pd.DataFrame([{
+            "Leg": f"{airports[leg['from']][2]} → {airports[leg['to']][2]}",
+            "Distance": f"{leg['dist_km']:.0f} km",
+            "Charge Before": f"{int(leg['charge_h'] * 60)} min",
+            **({"Refuel Before": f"{int(leg['refuel_h'] * 60)} min"} if is_hybrid else {}),
+            "Block Time": f"{int(leg['block_h'])}h {int((leg['block_h'] % 1) * 60)}m"
+        } for leg in trip["legs"]]), use_container_width=True, hide_index=True, key=f"{key_prefix}_trip_legs")
+
+    # Hybrid range analysis
+    if is_hybrid:
         st.markdown("---")
-        st.markdown("**Route & Performance**")
-        route_col1, route_col2, route_col3, route_col4 = st.columns(4)
-        with route_col1:
-            st.metric("📏 Route Distance", f"{max_dist_km:.0f} km")
-        with route_col2:
-            st.metric("✈️ Cruise Speed", f"{cruise_speed_kmh:.0f} km/h")
-        with route_col3:
-            st.metric("⏱️ Travel Time", f"{travel_time_hours_int}h {travel_time_minutes}m")
-        with route_col4:
-            status_ratio = "✅" if battery_feasible else "❌"
-            st.metric("🔋 Battery/Power", f"{battery_to_power_ratio_wh_kw:.0f} Wh/kW {status_ratio}", "800 Wh/kW max")
-        
+        st.markdown('<h3 class="section-header">⚡🔥 Hybrid Range Analysis</h3>', unsafe_allow_html=True)
+
+        hybrid_col1, hybrid_col2, hybrid_col3 = st.columns(3)
+        with hybrid_col1:
+            st.metric("🔋 Electric-Only Range", f"{electric_only_range_km:.0f} km")
+        with hybrid_col2:
+            st.metric("⛽ Turboprop Range", f"{fuel_only_range_km:.0f} km")
+        with hybrid_col3:
+            st.metric("🚀 Total Extended Range", f"{total_extended_range_km:.0f} km")
+
         st.markdown("---")
-        st.markdown("**Energy Budget**")
-        
-        climb_kwh = e_climb_j / 3.6e6
-        cruise_kwh = e_cruise_j / 3.6e6
-        descent_kwh = e_descent_j / 3.6e6
-        taxi_kwh = e_taxi_j / 3.6e6
-        fixed_kwh = 20.0
-        
-        energy_col1, energy_col2, energy_col3, energy_col4, energy_col5 = st.columns(5)
-        with energy_col1:
-            st.metric("Taxi", f"{taxi_kwh:.1f} kWh")
-        with energy_col2:
-            st.metric("Climb", f"{climb_kwh:.1f} kWh")
-        with energy_col3:
-            st.metric("Cruise", f"{cruise_kwh:.1f} kWh")
-        with energy_col4:
-            st.metric("Descent", f"{descent_kwh:.1f} kWh")
-        with energy_col5:
-            st.metric("Reserve", f"{fixed_kwh:.1f} kWh")
-        
-        # Energy breakdown visualization
+        st.markdown("**Cruise Power Split**")
+        split_col1, split_col2, split_col3 = st.columns(3)
+        with split_col1:
+            st.metric("⚡ Electric Motors", f"{electric_cruise_power_kw:.0f} kW ({100-turboprop_cruise_fraction:.0f}%)")
+        with split_col2:
+            st.metric("🔥 Turboprops", f"{turboprop_cruise_power_kw:.0f} kW ({turboprop_cruise_fraction:.0f}%)")
+        with split_col3:
+            st.metric("📊 Total Cruise Power", f"{p_elec_cruise_w/1000:.0f} kW")
+
         st.markdown("---")
-        st.markdown("**Energy Usage Breakdown**")
-        
-        # Create pie chart
-        energy_stages = ['Taxi', 'Climb', 'Cruise', 'Descent', 'Reserve']
-        energy_values = [taxi_kwh, climb_kwh, cruise_kwh, descent_kwh, fixed_kwh]
-        colors = ['#FFB6B9', '#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=energy_stages,
-            values=energy_values,
-            marker=dict(colors=colors),
-            textposition='inside',
-            textinfo='label+percent+value',
-            hovertemplate='<b>%{label}</b><br>Energy: %{value:.1f} kWh<br>Percentage: %{percent}<extra></extra>'
+        st.markdown("**Fuel Management**")
+        fuel_col1, fuel_col2, fuel_col3 = st.columns(3)
+        with fuel_col1:
+            st.metric("✈️ Cruise Duration", f"{cruise_time_h:.1f} h")
+        with fuel_col2:
+            st.metric("⛽ Fuel Burn Rate", f"{cruise_fuel_consumption_kgh:.1f} kg/h")
+        with fuel_col3:
+            st.metric("📦 Fuel Tank Mass", f"{fuel_tank_mass_kg:.0f} kg")
+
+    # Pure Electric vs Hybrid Comparison
+    st.markdown("---")
+    st.markdown('<h3 class="section-header">⚡ Pure Electric vs 🔥 Hybrid Powertrain Comparison</h3>', unsafe_allow_html=True)
+
+    # Calculate metrics for pure electric
+    pure_electric_mass_kg = empty_base_kg + payload_kg + battery_mass_kg + parachute_mass_kg
+    pure_electric_range_km = electric_only_range_km
+    pure_electric_weight_efficiency = pure_electric_mass_kg / pure_electric_range_km if pure_electric_range_km > 0 else 0
+    pure_electric_energy_efficiency = pure_electric_range_km / battery_kwh if battery_kwh > 0 else 0
+
+    # Calculate metrics for hybrid
+    if is_hybrid:
+        hybrid_mass_kg = total_mass_kg
+        hybrid_combined_range_km = total_extended_range_km
+        hybrid_weight_efficiency = hybrid_mass_kg / hybrid_combined_range_km if hybrid_combined_range_km > 0 else 0
+
+        # Energy per distance: combined electric + fuel energy
+        total_energy_mj = (battery_kwh * 3.6) + (total_fuel_capacity_kg * fuel_energy_density_mj_kg)
+        hybrid_energy_efficiency = hybrid_combined_range_km / (total_energy_mj / 3.6) if (total_energy_mj / 3.6) > 0 else 0  # Convert MJ to kWh
+
+    comp_col1, comp_col2, comp_col3 = st.columns(3)
+
+    with comp_col1:
+        st.markdown("**Pure Electric** ⚡")
+        st.write(f"**Max Mass:** {pure_electric_mass_kg:.0f} kg")
+        st.write(f"**Max Range:** {pure_electric_range_km:.0f} km")
+        st.write(f"**Weight/Distance:** {pure_electric_weight_efficiency:.2f} kg/km")
+        st.write(f"**Energy Efficiency:** {pure_electric_energy_efficiency:.2f} km/kWh")
+        st.write(f"**Battery:** {battery_kwh:.0f} kWh")
+
+    with comp_col2:
+        if is_hybrid:
+            st.markdown("**Hybrid (2E+2TP)** 🔥")
+            st.write(f"**Max Mass:** {hybrid_mass_kg:.0f} kg")
+            st.write(f"**Max Range:** {hybrid_combined_range_km:.0f} km")
+            st.write(f"**Weight/Distance:** {hybrid_weight_efficiency:.2f} kg/km")
+            st.write(f"**Energy Efficiency:** {hybrid_energy_efficiency:.2f} km/kWh-eq")
+            st.write(f"**Battery:** {battery_kwh:.0f} kWh | **Fuel:** {total_fuel_capacity_kg:.0f} kg")
+        else:
+            st.info("Switch to 'Hybrid (2E + 2TP)' mode to see comparison")
+
+    with comp_col3:
+        if is_hybrid:
+            st.markdown("**Advantage** 📊")
+            range_improvement = ((hybrid_combined_range_km - pure_electric_range_km) / pure_electric_range_km * 100) if pure_electric_range_km > 0 else 0
+            mass_difference = hybrid_mass_kg - pure_electric_mass_kg
+
+            if range_improvement > 0:
+                st.write(f"🚀 **+{range_improvement:.0f}%** range increase")
+            else:
+                st.write(f"📉 **{range_improvement:.0f}%** range difference")
+
+            st.write(f"**+{mass_difference:.0f} kg** additional mass")
+
+            if hybrid_weight_efficiency < pure_electric_weight_efficiency:
+                efficiency_gain = ((pure_electric_weight_efficiency - hybrid_weight_efficiency) / pure_electric_weight_efficiency * 100)
+                st.write(f"✅ **{efficiency_gain:.0f}%** better weight efficiency")
+            else:
+                efficiency_loss = ((hybrid_weight_efficiency - pure_electric_weight_efficiency) / pure_electric_weight_efficiency * 100)
+                st.write(f"❌ **{efficiency_loss:.0f}%** worse weight efficiency")
+
+            # Payload fraction analysis
+            payload_fraction_pure = payload_kg / pure_electric_mass_kg * 100
+            payload_fraction_hybrid = payload_kg / hybrid_mass_kg * 100
+            st.write(f"**Payload %:** {payload_fraction_pure:.1f}% (E) vs {payload_fraction_hybrid:.1f}% (H)")
+
+    st.markdown("---")
+    st.success("✓ Sizing complete!")
+
+# Updated Calculate Optimal Sizing block (heuristic approach - no optimization)
+if max_dist_km > 0 and st.button("🚀 Calculate Aircraft Sizing", use_container_width=True):
+    with st.spinner("⏳ Computing sizing..."):
+        st.session_state.sizing_result = {
+            "inputs": dict(sizing_inputs),
+            "routes": list(st.session_state.routes),
+            "result": size_aircraft(**sizing_inputs),
+        }
+
+# Keep the last sizing on screen across reruns while its inputs and routes are unchanged
+current_sizing = st.session_state.get("sizing_result")
+if max_dist_km > 0 and current_sizing and current_sizing["inputs"] == sizing_inputs and current_sizing["routes"] == st.session_state.routes:
+    render_sizing_results(current_sizing["result"], current_sizing["routes"], key_prefix="sizing")
+else:
+    current_sizing = None
+
+# Multi-objective design search (NSGA-II over AR, target CL, parachute mass, speed and altitude)
+if max_dist_km > 0:
+    st.markdown("---")
+    st.markdown('<h3 class="section-header">🧬 Design Trade-off Explorer</h3>', unsafe_allow_html=True)
+    st.caption("Searches aspect ratio, target CL, parachute mass, cruise speed and altitude for the Pareto front of MTOW, block time and energy per passenger-km over your routes.")
+
+    pareto_col1, pareto_col2, pareto_col3 = st.columns([2, 2, 1])
+    with pareto_col1:
+        pop_size = st.number_input("🧬 Population Size", 50, 5000, 400, 50, help="Larger populations cover the front more densely; around 4,000 designs take about 1.5 s per generation")
+    with pareto_col2:
+        n_generations = st.number_input("🔁 Generations", 5, 200, 30)
+    with pareto_col3:
+        st.write("##")
+        run_pareto = st.button("🔍 Find Pareto Front", use_container_width=True)
+
+    if run_pareto:
+        progress_bar = st.progress(0.0, text="⏳ Evaluating designs...")
+        st.session_state.pareto_front = run_nsga2(
+            sizing_inputs,
+            st.session_state.routes,
+            pop_size=int(pop_size),
+            n_generations=int(n_generations),
+            progress=lambda gen, n_gen: progress_bar.progress(gen / n_gen, text=f"⏳ Generation {gen}/{n_gen}")
+        )
+        st.session_state.pareto_inputs = dict(sizing_inputs)
+        st.session_state.pareto_routes = list(st.session_state.routes)
+        progress_bar.empty()
+
+    # Like the sizing results, a front only applies to the inputs and routes it was searched for
+    if "pareto_front" in st.session_state and (
+        st.session_state.pareto_inputs != sizing_inputs or st.session_state.pareto_routes != st.session_state.routes
+    ):
+        for key in ("pareto_front", "pareto_inputs", "pareto_routes"):
+            del st.session_state[key]
+
+    front = st.session_state.get("pareto_front")
+    if front:
+        fig_pareto = go.Figure(data=[go.Scatter(
+            x=[p["mtow_kg"] for p in front],
+            y=[p["block_time_h"] * 60 for p in front],
+            mode="markers",
+            marker=dict(
+                size=9,
+                symbol=["circle" if p["battery_feasible"] else "x" for p in front],
+                color=[p["energy_kwh_per_pax_km"] for p in front],
+                colorscale="Viridis",
+                colorbar=dict(title="kWh/pax-km")
+            ),
+            customdata=[[
+                p["design"]["ar_guess"],
+                p["design"]["target_cl"],
+                p["design"]["parachute_mass_kg"],
+                p["design"]["cruise_speed_kmh"],
+                p["design"]["cruise_altitude_ft"],
+                p["charger_kw"],
+                p["energy_kwh_per_pax_km"]
+            ] for p in front],
+            hovertemplate=(
+                "<b>MTOW:</b> %{x:.0f} kg<br><b>Block Time:</b> %{y:.0f} min<br>"
+                "<b>Energy:</b> %{customdata[6]:.3f} kWh/pax-km<br><b>Charger:</b> %{customdata[5]:.0f} kW<br>"
+                "AR %{customdata[0]:.1f} | CL %{customdata[1]:.2f} | Parachute %{customdata[2]:.0f} kg<br>"
+                "%{customdata[3]:.0f} km/h @ %{customdata[4]:.0f} ft<extra></extra>"
+            )
         )])
-        
-        fig.update_layout(
-            height=400,
-            showlegend=True,
+        fig_pareto.update_layout(
+            height=450,
+            xaxis_title="MTOW (kg)",
+            yaxis_title="Mean Block Time (min)",
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)',
             font=dict(size=12)
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        st.markdown("---")
-        st.markdown(f'<div class="metric-card"><strong>🔌 Required Charger (for {desired_charge_time_h:.1f}h to 80%):</strong> {charger_kw:.0f} kW</div>', unsafe_allow_html=True)
-        
-        # Performance analysis for each route
-        st.markdown("---")
-        st.markdown('<h3 class="section-header">📊 Performance on Each Route</h3>', unsafe_allow_html=True)
-        
-        route_performance = []
-        for idx, route in enumerate(st.session_state.routes):
-            route_dist = route['dist_km']
-            route_time = route_dist / cruise_speed_kmh
-            route_time_h = int(route_time)
-            route_time_m = int((route_time % 1) * 60)
-            
-            # Estimate energy for this route (simple linear scaling from cruise energy)
-            route_cruise_energy = (cruise_kwh / max_dist_km) * route_dist if max_dist_km > 0 else cruise_kwh
-            
-            # Estimate total energy (climb + cruise + descent + taxi + reserve)
-            route_climb_energy = (climb_kwh / max_dist_km) * route_dist if max_dist_km > 0 else climb_kwh
-            route_descent_energy = (descent_kwh / max_dist_km) * route_dist if max_dist_km > 0 else descent_kwh
-            route_total_mission = taxi_kwh + route_climb_energy + route_cruise_energy + route_descent_energy + fixed_kwh
-            
-            # Check if feasible
-            feasible = "✅" if route_total_mission <= battery_kwh * 0.85 else "⚠️"
-            margin = ((battery_kwh * 0.85 - route_total_mission) / (battery_kwh * 0.85)) * 100 if route_total_mission > 0 else 0
-            
-            route_performance.append({
-                "Route": f"{route['origin_name']} → {route['dest_name']}",
-                "Distance": f"{route_dist} km",
-                "Flight Time": f"{route_time_h}h {route_time_m}m",
-                "Mission Energy": f"{route_total_mission:.0f} kWh",
-                "Battery Capacity": f"{battery_kwh:.0f} kWh (85%: {battery_kwh*0.85:.0f})",
-                "Status": feasible,
-                "Margin": f"{margin:.0f}%" if margin >= 0 else "❌ INFEASIBLE"
-            })
-        
-        # Display as table
+
+        st.markdown(f"**{len(front)} Pareto-optimal designs** — click a point to open its full sizing results (✖ = battery too large)")
+        pareto_event = st.plotly_chart(fig_pareto, use_container_width=True, on_select="rerun", selection_mode="points", key="pareto_chart")
+
+        selected_points = pareto_event.selection.points if pareto_event else []
+        if selected_points:
+            chosen = front[selected_points[0]["point_index"]]
+            chosen_result = size_aircraft(**{**st.session_state.pareto_inputs, **chosen["design"]})
+            render_sizing_results(chosen_result, st.session_state.pareto_routes, key_prefix="pareto")
+
+# Shared scenario library: saved route sets, inputs and results, queryable across sessions
+st.markdown("---")
+st.markdown('<h3 class="section-header">💾 Scenario Library</h3>', unsafe_allow_html=True)
+store = get_scenario_store()
+
+def load_scenario_into_session(scenario_id):
+    """Restore a saved scenario's routes, configuration and stored results, then redraw."""
+    scenario = store.load_scenario(scenario_id)
+    st.session_state.routes = [dict(r) for r in scenario["routes"]]
+    st.session_state.pending_config_inputs = scenario["inputs"]
+    st.session_state.loaded_scenario = scenario
+    if scenario["result"]:
+        st.session_state.sizing_result = {
+            "inputs": scenario["inputs"],
+            "routes": st.session_state.routes,
+            "result": scenario["result"],
+        }
+    st.rerun()
+
+save_tab, load_tab, search_tab = st.tabs(["💾 Save", "📂 Load", "🔎 Search"])
+
+with save_tab:
+    if max_dist_km > 0:
+        scenario_name = st.text_input("📝 Scenario Name", f"{len(st.session_state.routes)} routes, {max_dist_km:.0f} km max")
+        if st.button("💾 Save Current Scenario", use_container_width=True):
+            # Saved with its result so loading never re-runs the sizing
+            saved_result = current_sizing["result"] if current_sizing else size_aircraft(**sizing_inputs)
+            scenario_id = store.save_scenario(scenario_name, sizing_inputs, st.session_state.routes, saved_result)
+            st.success(f"✓ Saved scenario #{scenario_id}: {scenario_name}")
+    else:
+        st.info("Add routes to save a scenario")
+
+with load_tab:
+    saved_scenarios = store.list_scenarios()
+    if saved_scenarios:
+        chosen_id = st.selectbox(
+            "📂 Saved Scenarios",
+            [s["id"] for s in saved_scenarios],
+            format_func=lambda sid: next(
+                f"#{s['id']} {s['name']} — "
+                + (f"{s['mtow_kg']:.0f} kg MTOW, " if s["mtow_kg"] is not None else "no results, ")
+                + time.strftime('%Y-%m-%d %H:%M', time.localtime(s['created_at']))
+                for s in saved_scenarios if s["id"] == sid
+            )
+        )
+        if st.button("📂 Load Scenario", use_container_width=True):
+            load_scenario_into_session(chosen_id)
+    else:
+        st.info("No saved scenarios yet")
+
+    # A loaded scenario's results only apply while its route list is unchanged
+    loaded = st.session_state.get("loaded_scenario")
+    if loaded and loaded["routes"] != st.session_state.routes:
+        del st.session_state.loaded_scenario
+        loaded = None
+    if loaded and loaded["result"]:
+        if current_sizing and current_sizing["result"] == loaded["result"]:
+            st.caption(f"Scenario #{loaded['id']}: {loaded['name']} matches the sizing results shown above")
+        else:
+            st.caption(f"Showing stored results for scenario #{loaded['id']}: {loaded['name']} (routes and configuration loaded above)")
+            render_sizing_results(loaded["result"], loaded["routes"], key_prefix="loaded")
+
+with search_tab:
+    airport_codes = ["Any"] + sorted(COMMON_AIRPORTS)
+    search_col1, search_col2, search_col3 = st.columns(3)
+    with search_col1:
+        search_max_mtow = st.number_input("⚖️ Max MTOW (kg)", 0, 100000, 3000, 100)
+    with search_col2:
+        search_origin = st.selectbox("🛫 Covers Route From", airport_codes, key="search_origin")
+    with search_col3:
+        search_dest = st.selectbox("🛬 To", airport_codes, key="search_dest")
+
+    covers = None
+    if search_origin != "Any" and search_dest != "Any":
+        covers = (COMMON_AIRPORTS[search_origin][:2], COMMON_AIRPORTS[search_dest][:2])
+    matches = store.query(max_mtow_kg=search_max_mtow or None, covers=covers)
+    if matches:
         import pandas as pd
-        df_routes = pd.DataFrame(route_performance)
-        st.dataframe(df_routes, use_container_width=True, hide_index=True)
-        
-        # Hybrid range analysis
-        if is_hybrid:
-            st.markdown("---")
-            st.markdown('<h3 class="section-header">⚡🔥 Hybrid Range Analysis</h3>', unsafe_allow_html=True)
-            
-            hybrid_col1, hybrid_col2, hybrid_col3 = st.columns(3)
-            with hybrid_col1:
-                st.metric("🔋 Electric-Only Range", f"{electric_only_range_km:.0f} km")
-            with hybrid_col2:
-                st.metric("⛽ Turboprop Range", f"{fuel_only_range_km:.0f} km")
-            with hybrid_col3:
-                st.metric("🚀 Total Extended Range", f"{total_extended_range_km:.0f} km")
-            
-            st.markdown("---")
-            st.markdown("**Cruise Power Split**")
-            split_col1, split_col2, split_col3 = st.columns(3)
-            with split_col1:
-                st.metric("⚡ Electric Motors", f"{electric_cruise_power_kw:.0f} kW ({100-turboprop_cruise_fraction:.0f}%)")
-            with split_col2:
-                st.metric("🔥 Turboprops", f"{turboprop_cruise_power_kw:.0f} kW ({turboprop_cruise_fraction:.0f}%)")
-            with split_col3:
-                st.metric("📊 Total Cruise Power", f"{p_elec_cruise_w/1000:.0f} kW")
-            
-            st.markdown("---")
-            st.markdown("**Fuel Management**")
-            fuel_col1, fuel_col2, fuel_col3 = st.columns(3)
-            with fuel_col1:
-                st.metric("✈️ Cruise Duration", f"{cruise_time_h:.1f} h")
-            with fuel_col2:
-                st.metric("⛽ Fuel Burn Rate", f"{cruise_fuel_consumption_kgh:.1f} kg/h")
-            with fuel_col3:
-                st.metric("📦 Fuel Tank Mass", f"{fuel_tank_mass_kg:.0f} kg")
-        
-        # Pure Electric vs Hybrid Comparison
-        st.markdown("---")
-        st.markdown('<h3 class="section-header">⚡ Pure Electric vs 🔥 Hybrid Powertrain Comparison</h3>', unsafe_allow_html=True)
-        
-        # Calculate metrics for pure electric
-        pure_electric_mass_kg = empty_base_kg + payload_kg + battery_mass_kg + parachute_mass_kg
-        pure_electric_range_km = electric_only_range_km if is_hybrid else (battery_kwh * 3600 / (p_elec_cruise_w / 1000)) * (cruise_speed_kmh / 3.6) / 1000 if p_elec_cruise_w > 0 else 0
-        pure_electric_weight_efficiency = pure_electric_mass_kg / pure_electric_range_km if pure_electric_range_km > 0 else 0
-        pure_electric_energy_efficiency = pure_electric_range_km / battery_kwh if battery_kwh > 0 else 0
-        
-        # Calculate metrics for hybrid
-        if is_hybrid:
-            hybrid_mass_kg = total_mass_kg
-            hybrid_combined_range_km = total_extended_range_km
-            hybrid_weight_efficiency = hybrid_mass_kg / hybrid_combined_range_km if hybrid_combined_range_km > 0 else 0
-            
-            # Energy per distance: combined electric + fuel energy
-            total_energy_mj = (battery_kwh * 3.6) + (total_fuel_capacity_kg * fuel_energy_density_mj_kg)
-            hybrid_energy_efficiency = hybrid_combined_range_km / (total_energy_mj / 3.6) if (total_energy_mj / 3.6) > 0 else 0  # Convert MJ to kWh
-        
-        comp_col1, comp_col2, comp_col3 = st.columns(3)
-        
-        with comp_col1:
-            st.markdown("**Pure Electric** ⚡")
-            st.write(f"**Max Mass:** {pure_electric_mass_kg:.0f} kg")
-            st.write(f"**Max Range:** {pure_electric_range_km:.0f} km")
-            st.write(f"**Weight/Distance:** {pure_electric_weight_efficiency:.2f} kg/km")
-            st.write(f"**Energy Efficiency:** {pure_electric_energy_efficiency:.2f} km/kWh")
-            st.write(f"**Battery:** {battery_kwh:.0f} kWh")
-        
-        with comp_col2:
-            if is_hybrid:
-                st.markdown("**Hybrid (2E+2TP)** 🔥")
-                st.write(f"**Max Mass:** {hybrid_mass_kg:.0f} kg")
-                st.write(f"**Max Range:** {hybrid_combined_range_km:.0f} km")
-                st.write(f"**Weight/Distance:** {hybrid_weight_efficiency:.2f} kg/km")
-                st.write(f"**Energy Efficiency:** {hybrid_energy_efficiency:.2f} km/kWh-eq")
-                st.write(f"**Battery:** {battery_kwh:.0f} kWh | **Fuel:** {total_fuel_capacity_kg:.0f} kg")
-            else:
-                st.info("Switch to 'Hybrid (2E + 2TP)' mode to see comparison")
-        
-        with comp_col3:
-            if is_hybrid:
-                st.markdown("**Advantage** 📊")
-                range_improvement = ((hybrid_combined_range_km - pure_electric_range_km) / pure_electric_range_km * 100) if pure_electric_range_km > 0 else 0
-                mass_difference = hybrid_mass_kg - pure_electric_mass_kg
-                
-                if range_improvement > 0:
-                    st.write(f"🚀 **+{range_improvement:.0f}%** range increase")
-                else:
-                    st.write(f"📉 **{range_improvement:.0f}%** range difference")
-                
-                st.write(f"**+{mass_difference:.0f} kg** additional mass")
-                
-                if hybrid_weight_efficiency < pure_electric_weight_efficiency:
-                    efficiency_gain = ((pure_electric_weight_efficiency - hybrid_weight_efficiency) / pure_electric_weight_efficiency * 100)
-                    st.write(f"✅ **{efficiency_gain:.0f}%** better weight efficiency")
-                else:
-                    efficiency_loss = ((hybrid_weight_efficiency - pure_electric_weight_efficiency) / pure_electric_weight_efficiency * 100)
-                    st.write(f"❌ **{efficiency_loss:.0f}%** worse weight efficiency")
-                
-                # Payload fraction analysis
-                payload_fraction_pure = payload_kg / pure_electric_mass_kg * 100
-                payload_fraction_hybrid = payload_kg / hybrid_mass_kg * 100
-                st.write(f"**Payload %:** {payload_fraction_pure:.1f}% (E) vs {payload_fraction_hybrid:.1f}% (H)")
-        
-        st.markdown("---")
-        st.success("✓ Sizing complete!")
+        st.dataframe(pd.DataFrame([{
+            "ID": m["id"],
+            "Scenario": m["name"],
+            "Powertrain": "Hybrid" if m["is_hybrid"] else "Electric",
+            "Passengers": m["num_pass"],
+            "Longest Route": f"{m['max_dist_km']:.0f} km",
+            "MTOW": f"{m['mtow_kg']:.0f} kg",
+            "Battery": f"{m['battery_kwh']:.0f} kWh",
+            "Charger": f"{m['charger_kw']:.0f} kW"
+        } for m in matches]), use_container_width=True, hide_index=True)
+        match_col, match_button_col = st.columns([3, 1])
+        with match_col:
+            match_id = st.selectbox(
+                "📂 Open Match",
+                [m["id"] for m in matches],
+                format_func=lambda mid: next(f"#{m['id']} {m['name']}" for m in matches if m["id"] == mid),
+                key="search_match",
+            )
+        with match_button_col:
+            if st.button("📂 Load Match", use_container_width=True):
+                load_scenario_into_session(match_id)
+    else:
+        st.info("No saved designs match")
 
 st.markdown("---")
-st.caption("✈️ Electric Airplane Sizing Tool | Default Route: Bengaluru → Delhi | Heuristic Sizing Model | Hybrid: 2 Electric + 2 Turboprop")
\ No newline at end of file
+st.caption("✈️ Electric Airplane Sizing Tool | Default Route: Bengaluru → Delhi | Heuristic Sizing Model | Hybrid: 2 Electric + 2 Turboprop")
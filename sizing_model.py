@@ -0,0 +1,316 @@
+"""Heuristic electric/hybrid aircraft sizing model.
+
+This is the same calculation the Streamlit app runs when "Calculate Aircraft
+Sizing" is pressed, pulled out of the script so it can be called outside a
+Streamlit session (e.g. from worker processes during a design-space search).
+"""
+import math
+
+import aerosandbox as asb
+import aerosandbox.numpy as np
+
+G = 9.81
+OSWALD_E = 0.82
+CD_MISC = 0.003
+E_TAXI_J = 8e3 * 3600  # ~8 kWh for taxi (pre and post flight)
+E_FIXED_J = 20e3 * 3600  # Reserve
+FIXED_KWH = 20.0
+FUEL_ENERGY_DENSITY_MJ_KG = 43.0  # Jet fuel
+TURBOPROP_EFFICIENCY = 0.78
+MAX_PRACTICAL_RATIO = 800  # Wh/kW - anything higher is physically too large
+USABLE_FRACTION = 0.85
+BLOCK_OVERHEAD_H = 0.25  # Taxi, climb and descent allowance added to cruise time
+
+# Design constants that used to be hard-coded in the app
+DEFAULT_AR = 12
+DEFAULT_TARGET_CL = 0.6
+DEFAULT_PARACHUTE_MASS_KG = 60
+
+
+def _clip(x, lo, hi):
+    return min(max(x, lo), hi)
+
+
+def air_density(cruise_altitude_m):
+    """ISA density at altitude; accepts a scalar or an array of altitudes."""
+    atm = asb.Atmosphere(altitude=cruise_altitude_m)
+    if np.ndim(cruise_altitude_m):
+        return np.asarray(atm.density(), dtype=float)
+    return float(atm.density())
+
+
+def size_aircraft(
+    max_dist_km,
+    num_pass,
+    cargo_kg,
+    is_hybrid=False,
+    cruise_speed_kmh=200,
+    cruise_altitude_ft=6000,
+    battery_density=240,
+    efficiency=0.85,
+    peak_to_cruise_ratio=1.8,
+    desired_charge_time_h=1.5,
+    parasite_cd0=0.022,
+    empty_base_kg=900,
+    pass_weight_kg=100,
+    turboprop_cruise_fraction=75,
+    cruise_fuel_consumption_kgh=25,
+    ar_guess=DEFAULT_AR,
+    target_cl=DEFAULT_TARGET_CL,
+    parachute_mass_kg=DEFAULT_PARACHUTE_MASS_KG,
+    rho=None,
+):
+    """Size an aircraft for the longest leg and return every computed quantity as a dict.
+
+    ``rho`` may be passed in to skip the atmosphere lookup when the caller
+    already knows the cruise density.
+    """
+    cruise_altitude_m = cruise_altitude_ft * 0.3048  # Convert feet to meters
+    distance_m = max_dist_km * 1000
+    v_cruise_ms = cruise_speed_kmh / 3.6
+    payload_kg = num_pass * pass_weight_kg + cargo_kg
+
+    if rho is None:
+        rho = air_density(cruise_altitude_m)
+
+    # Step 1: Estimate cruise power
+    # Power = (Drag × Velocity) / Efficiency
+    # For a given wing area and weight, CL = Weight / (0.5 * rho * v^2 * S)
+    # Start with a reasonable estimate of wing area
+    wing_area_guess = 12 + payload_kg / 25  # m² - empirical formula
+    total_mass_guess = empty_base_kg + payload_kg + parachute_mass_kg + 200  # +200 kg for battery guess
+    weight_n = total_mass_guess * G
+
+    # CL at cruise
+    cl_cruise = weight_n / (0.5 * rho * v_cruise_ms**2 * wing_area_guess)
+    cl_cruise = _clip(cl_cruise, 0.25, 1.3)
+
+    # Induced drag coefficient
+    cd_induced = (cl_cruise**2) / (math.pi * ar_guess * OSWALD_E)
+    cd_total = cd_induced + parasite_cd0 + CD_MISC
+
+    # Drag and power
+    drag_n = cd_total * 0.5 * rho * v_cruise_ms**2 * wing_area_guess
+    p_mech_cruise_w = drag_n * v_cruise_ms
+    p_elec_cruise_w = p_mech_cruise_w / efficiency
+
+    # Energy budgets - top level calculation
+    e_cruise_j = p_elec_cruise_w * (distance_m / v_cruise_ms)
+    e_pot_j = total_mass_guess * G * cruise_altitude_m
+    e_climb_j = e_pot_j * 2.2 / efficiency
+    e_descent_j = e_pot_j * 0.3 / efficiency  # ~30% of climb energy
+    e_taxi_j = E_TAXI_J
+    e_fixed_j = E_FIXED_J
+
+    e_mission_j = e_cruise_j + e_climb_j + e_descent_j + e_taxi_j + e_fixed_j
+    e_required_j = e_mission_j * 1.4  # 40% margin
+    e_gross_j = e_required_j / USABLE_FRACTION
+
+    battery_kwh = e_gross_j / 3.6e6
+    battery_mass_kg = (battery_kwh * 1000) / battery_density
+
+    # Step 2: Refine total mass and wing area iteratively
+    for iteration in range(3):
+        # For hybrid: account for fuel tank mass
+        if is_hybrid:
+            # Estimate fuel needed for cruise on longest leg
+            cruise_time_h = distance_m / v_cruise_ms / 3600
+            fuel_mass_kg = cruise_fuel_consumption_kgh * cruise_time_h * 1.3  # 30% reserve
+            # Add fuel tank structure (typically 10-15% of fuel mass)
+            fuel_tank_mass_kg = fuel_mass_kg * 0.12
+        else:
+            fuel_mass_kg = 0
+            fuel_tank_mass_kg = 0
+
+        total_mass_kg = empty_base_kg + payload_kg + battery_mass_kg + parachute_mass_kg + fuel_mass_kg + fuel_tank_mass_kg
+        weight_n = total_mass_kg * G
+
+        # Adjust wing area to maintain reasonable CL
+        wing_area = weight_n / (0.5 * rho * target_cl * v_cruise_ms**2)
+        wing_area = _clip(wing_area, 10, 75)
+
+        # Recalculate power and energy
+        cl_new = weight_n / (0.5 * rho * v_cruise_ms**2 * wing_area)
+        cd_induced_new = (cl_new**2) / (math.pi * ar_guess * OSWALD_E)
+        cd_total_new = cd_induced_new + parasite_cd0 + CD_MISC
+
+        drag_n = cd_total_new * 0.5 * rho * v_cruise_ms**2 * wing_area
+        p_mech_cruise_w = drag_n * v_cruise_ms
+        p_elec_cruise_w = p_mech_cruise_w / efficiency
+
+        e_cruise_j = p_elec_cruise_w * (distance_m / v_cruise_ms)
+        e_climb_j = (total_mass_kg * G * cruise_altitude_m) * 2.2 / efficiency
+
+        # Add descent and taxi energy
+        e_descent_j = (total_mass_kg * G * cruise_altitude_m) * 0.3 / efficiency  # ~30% of climb energy
+
+        e_mission_j = e_cruise_j + e_climb_j + e_descent_j + e_taxi_j + e_fixed_j
+
+        if is_hybrid:
+            # For hybrid: electric covers climb + taxi + descent + reserve
+            # Turboprops cover cruise (75% power)
+            e_electric_mission_j = e_climb_j + e_descent_j + e_taxi_j + e_fixed_j
+            e_required_j = e_electric_mission_j * 1.4
+        else:
+            e_required_j = e_mission_j * 1.4
+
+        e_gross_j = e_required_j / USABLE_FRACTION
+
+        battery_kwh = e_gross_j / 3.6e6
+        battery_mass_kg = (battery_kwh * 1000) / battery_density
+
+    # Final calculations
+    total_mass_kg = empty_base_kg + payload_kg + battery_mass_kg + parachute_mass_kg
+    if is_hybrid:
+        total_mass_kg += fuel_mass_kg + fuel_tank_mass_kg
+
+    weight_n = total_mass_kg * G
+    cl_final = weight_n / (0.5 * rho * v_cruise_ms**2 * wing_area)
+    cd_induced_final = (cl_final**2) / (math.pi * ar_guess * OSWALD_E)
+    cd_final = cd_induced_final + parasite_cd0 + CD_MISC
+    ld_final = cl_final / cd_final
+
+    p_peak_kw = (p_elec_cruise_w / 1000) * peak_to_cruise_ratio
+    motor_power_kw = round(p_peak_kw / 4)
+    v_max_kmh = cruise_speed_kmh * (peak_to_cruise_ratio ** (1/3))
+    charger_kw = (battery_kwh * 0.8) / desired_charge_time_h
+
+    # Calculate travel time (cruise only, excludes climb and descent)
+    travel_time_hours = max_dist_km / cruise_speed_kmh
+
+    # Electric-only range with battery
+    electric_only_range_km = (battery_kwh * 3600 / (p_elec_cruise_w / 1000)) * (cruise_speed_kmh / 3.6) / 1000 if p_elec_cruise_w > 0 else 0
+
+    # Hybrid-specific calculations
+    electric_cruise_power_kw = turboprop_cruise_power_kw = None
+    cruise_time_h = total_fuel_capacity_kg = None
+    fuel_only_range_km = total_extended_range_km = None
+    if is_hybrid:
+        # Cruise power split: electric + turboprop
+        electric_cruise_power_kw = p_elec_cruise_w / 1000 * (100 - turboprop_cruise_fraction) / 100
+        turboprop_cruise_power_kw = p_elec_cruise_w / 1000 * turboprop_cruise_fraction / 100
+
+        # Fuel needed for cruise on longest leg
+        cruise_time_h = max_dist_km / cruise_speed_kmh
+        fuel_for_cruise_kg = cruise_fuel_consumption_kgh * cruise_time_h
+        fuel_reserve_kg = fuel_for_cruise_kg * 0.3  # 30% reserve
+        total_fuel_capacity_kg = fuel_for_cruise_kg + fuel_reserve_kg
+
+        # Calculate fuel-only range with turboprops
+        fuel_energy_j = total_fuel_capacity_kg * FUEL_ENERGY_DENSITY_MJ_KG * 1e6  # Convert MJ to J
+        fuel_mechanical_energy_j = fuel_energy_j * TURBOPROP_EFFICIENCY
+        turboprop_mechanical_power_w = (turboprop_cruise_power_kw * 1000) / efficiency  # Convert to mech power
+        fuel_only_time_h = fuel_mechanical_energy_j / (turboprop_mechanical_power_w * 3600)
+        fuel_only_range_km = fuel_only_time_h * cruise_speed_kmh
+
+        # Total range: can fly on electric until battery low, then switch to turboprops
+        total_extended_range_km = electric_only_range_km + fuel_only_range_km
+
+    # Check battery feasibility (physical size constraint)
+    battery_to_power_ratio_wh_kw = (battery_kwh * 1000) / p_peak_kw if p_peak_kw > 0 else 0
+    battery_feasible = battery_to_power_ratio_wh_kw <= MAX_PRACTICAL_RATIO
+
+    return {
+        "max_dist_km": max_dist_km,
+        "num_pass": num_pass,
+        "cargo_kg": cargo_kg,
+        "is_hybrid": is_hybrid,
+        "cruise_speed_kmh": cruise_speed_kmh,
+        "cruise_altitude_ft": cruise_altitude_ft,
+        "battery_density": battery_density,
+        "efficiency": efficiency,
+        "peak_to_cruise_ratio": peak_to_cruise_ratio,
+        "desired_charge_time_h": desired_charge_time_h,
+        "parasite_cd0": parasite_cd0,
+        "pass_weight_kg": pass_weight_kg,
+        "turboprop_cruise_fraction": turboprop_cruise_fraction,
+        "cruise_fuel_consumption_kgh": cruise_fuel_consumption_kgh,
+        "ar_guess": ar_guess,
+        "target_cl": target_cl,
+        "parachute_mass_kg": parachute_mass_kg,
+        "payload_kg": payload_kg,
+        "empty_base_kg": empty_base_kg,
+        "total_mass_kg": total_mass_kg,
+        "battery_kwh": battery_kwh,
+        "battery_mass_kg": battery_mass_kg,
+        "fuel_mass_kg": fuel_mass_kg,
+        "fuel_tank_mass_kg": fuel_tank_mass_kg,
+        "wing_area": wing_area,
+        "ld_final": ld_final,
+        "p_elec_cruise_w": p_elec_cruise_w,
+        "p_peak_kw": p_peak_kw,
+        "motor_power_kw": motor_power_kw,
+        "v_max_kmh": v_max_kmh,
+        "charger_kw": charger_kw,
+        "travel_time_hours": travel_time_hours,
+        "e_taxi_j": e_taxi_j,
+        "e_climb_j": e_climb_j,
+        "e_cruise_j": e_cruise_j,
+        "e_descent_j": e_descent_j,
+        "electric_only_range_km": electric_only_range_km,
+        "electric_cruise_power_kw": electric_cruise_power_kw,
+        "turboprop_cruise_power_kw": turboprop_cruise_power_kw,
+        "cruise_time_h": cruise_time_h,
+        "total_fuel_capacity_kg": total_fuel_capacity_kg,
+        "fuel_only_range_km": fuel_only_range_km,
+        "total_extended_range_km": total_extended_range_km,
+        "battery_to_power_ratio_wh_kw": battery_to_power_ratio_wh_kw,
+        "battery_feasible": battery_feasible,
+    }
+
+
+def route_performance(result, routes):
+    """Mission energy and battery margin for each route flown by a sized aircraft.
+
+    Energy is scaled linearly from the longest-leg budget, as the app has always done.
+    """
+    max_dist_km = result["max_dist_km"]
+    battery_kwh = result["battery_kwh"]
+    climb_kwh = result["e_climb_j"] / 3.6e6
+    cruise_kwh = result["e_cruise_j"] / 3.6e6
+    descent_kwh = result["e_descent_j"] / 3.6e6
+    taxi_kwh = result["e_taxi_j"] / 3.6e6
+
+    performance = []
+    for route in routes:
+        route_dist = route['dist_km']
+        route_time = route_dist / result["cruise_speed_kmh"]
+
+        # Estimate energy for this route (simple linear scaling from cruise energy)
+        route_cruise_energy = (cruise_kwh / max_dist_km) * route_dist if max_dist_km > 0 else cruise_kwh
+
+        # Estimate total energy (climb + cruise + descent + taxi + reserve)
+        route_climb_energy = (climb_kwh / max_dist_km) * route_dist if max_dist_km > 0 else climb_kwh
+        route_descent_energy = (descent_kwh / max_dist_km) * route_dist if max_dist_km > 0 else descent_kwh
+        route_total_mission = taxi_kwh + route_climb_energy + route_cruise_energy + route_descent_energy + FIXED_KWH
+
+        margin = ((battery_kwh * USABLE_FRACTION - route_total_mission) / (battery_kwh * USABLE_FRACTION)) * 100 if route_total_mission > 0 else 0
+
+        performance.append({
+            "route": route,
+            "dist_km": route_dist,
+            "flight_time_h": route_time,
+            "mission_kwh": route_total_mission,
+            "feasible": route_total_mission <= battery_kwh * USABLE_FRACTION,
+            "margin_pct": margin,
+        })
+    return performance
+
+
+def energy_per_km_kwh(result):
+    """Climb + cruise + descent energy per km, scaled from the longest-leg budget like ``route_performance``."""
+    flight_kwh = (result["e_climb_j"] + result["e_cruise_j"] + result["e_descent_j"]) / 3.6e6
+    return flight_kwh / result["max_dist_km"]
+
+
+def max_leg_km(result):
+    """Longest single leg the sized aircraft can fly.
+
+    For the all-electric design this is where the mission energy used by
+    ``route_performance`` reaches the usable battery. Hybrids carry fuel for
+    the longest design leg, so that is their limit.
+    """
+    if result["is_hybrid"]:
+        return result["max_dist_km"]
+    usable_kwh = result["battery_kwh"] * USABLE_FRACTION - result["e_taxi_j"] / 3.6e6 - FIXED_KWH
+    return max(usable_kwh, 0.0) / energy_per_km_kwh(result)
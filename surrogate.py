@@ -0,0 +1,232 @@
+"""Polynomial surrogate of the sizing model for instant interactive estimates.
+
+The full sizing model is sampled offline over the configuration-panel input
+space and a quartic polynomial is fitted to the log of each output, one fit per
+powertrain (Passenger, Cargo-only and Mixed only differ through payload, so
+they share the electric fit). The fit is saved to a small ``.npz`` file and
+evaluates in microseconds. Queries outside the sampled box, or whose predicted
+MTOW lies near or beyond the divergent designs excluded from training, fall
+back to the full model.
+
+Retrain after changing ``sizing_model`` with::
+
+    python surrogate.py
+"""
+import inspect
+import itertools
+import os
+
+import numpy as np
+
+from sizing_model import air_density, size_aircraft
+
+SURROGATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "surrogate_model.npz")
+
+# (name, lower bound, upper bound) - matches the configuration panel widgets
+ELECTRIC_INPUTS = [
+    ("max_dist_km", 50.0, 1500.0),
+    ("payload_kg", 0.0, 4400.0),
+    ("cruise_speed_kmh", 150.0, 400.0),
+    ("cruise_altitude_ft", 3000.0, 16000.0),
+    ("battery_density", 200.0, 600.0),
+    ("efficiency", 0.70, 0.95),
+    ("parasite_cd0", 0.015, 0.040),
+    ("empty_base_kg", 500.0, 4000.0),
+]
+INPUT_SPACE = {
+    "electric": ELECTRIC_INPUTS,
+    "hybrid": ELECTRIC_INPUTS + [("cruise_fuel_consumption_kgh", 10.0, 50.0)],
+}
+
+OUTPUTS = ["total_mass_kg", "battery_kwh", "wing_area", "ld_final", "p_elec_cruise_w"]
+
+# Model inputs held at their defaults during training; other values need the full model
+FIXED_INPUTS = ["ar_guess", "target_cl", "parachute_mass_kg", "rho"]
+
+# Much of the electric input box sizes into a runaway battery-mass spiral; those
+# samples are left out of the fit
+MAX_TRAINED_MTOW_KG = 15000
+# Designs just past the cut-off can predict just below it, so predictions within
+# this fraction of the cut-off also fall back to the model
+FALLBACK_MARGIN = 0.2
+
+
+def _exponents(n_inputs, degree):
+    """All monomial exponent vectors of total degree <= ``degree``."""
+    terms = [e for e in itertools.product(range(degree + 1), repeat=n_inputs) if sum(e) <= degree]
+    return np.array(sorted(terms, key=sum), dtype=np.int8)
+
+
+def _features(U, exponents):
+    # Powers are tabulated once per input so each monomial is a product of lookups
+    powers = U[..., None] ** np.arange(exponents.max() + 1)
+    features = powers[..., 0, exponents[:, 0]]
+    for j in range(1, U.shape[-1]):
+        features = features * powers[..., j, exponents[:, j]]
+    return features
+
+
+def _latin_hypercube(rng, n, d):
+    strata = (np.argsort(rng.random((d, n)), axis=1).T + rng.random((n, d))) / n
+    return strata
+
+
+def _model_inputs(powertrain, row):
+    values = dict(zip([name for name, _, _ in INPUT_SPACE[powertrain]], row))
+    payload_kg = values.pop("payload_kg")
+    return {**values, "num_pass": 0, "cargo_kg": payload_kg, "is_hybrid": powertrain == "hybrid"}
+
+
+# Error estimates come from this many of the nearest hold-out designs
+ERROR_NEIGHBOURS = 40
+
+
+class Surrogate:
+    """Per-powertrain polynomial fits with their hold-out errors.
+
+    ``fits[powertrain]`` holds ``lower``/``upper`` input bounds, the monomial
+    ``exponents``, ``coefs`` (one column per output, fitted to log output),
+    and the hold-out designs the surrogate would serve: ``holdout_inputs``
+    (scaled to [-1, 1]) and ``holdout_error``, their relative error per output.
+    """
+
+    def __init__(self, fits):
+        self.fits = fits
+        # Flat (input, power) lookup per monomial so a single query is one gather and one product
+        self._gather = {
+            powertrain: np.arange(fit["exponents"].shape[1]) * (int(fit["exponents"].max()) + 1) + fit["exponents"]
+            for powertrain, fit in fits.items()
+        }
+
+    @classmethod
+    def load(cls, path=SURROGATE_PATH):
+        with np.load(path) as data:
+            fits = {}
+            for powertrain in INPUT_SPACE:
+                fits[powertrain] = {
+                    key: data[f"{powertrain}_{key}"]
+                    for key in ("lower", "upper", "exponents", "coefs", "holdout_inputs", "holdout_error")
+                }
+        return cls(fits)
+
+    def save(self, path=SURROGATE_PATH):
+        arrays = {
+            f"{powertrain}_{key}": value
+            for powertrain, fit in self.fits.items()
+            for key, value in fit.items()
+        }
+        np.savez_compressed(path, **arrays)
+
+    def predict(self, powertrain, x):
+        """Return (outputs, relative errors) for input vector ``x``, or None outside the trained region.
+
+        The error for each output is the largest relative error among the
+        ``ERROR_NEIGHBOURS`` hold-out designs nearest ``x``: typical for
+        similar designs, not a bound.
+        """
+        fit = self.fits[powertrain]
+        x = np.asarray(x, dtype=float)
+        if np.any(x < fit["lower"]) or np.any(x > fit["upper"]):
+            return None
+        U = 2 * (x - fit["lower"]) / (fit["upper"] - fit["lower"]) - 1
+        powers = U[:, None] ** np.arange(int(fit["exponents"].max()) + 1)
+        features = powers.ravel()[self._gather[powertrain]].prod(axis=1)
+        y = np.exp(features @ fit["coefs"])
+        if y[0] > MAX_TRAINED_MTOW_KG * (1 - FALLBACK_MARGIN):
+            return None
+        distance = ((fit["holdout_inputs"] - U) ** 2).sum(axis=1)
+        k = min(ERROR_NEIGHBOURS, len(distance))
+        nearest = np.argpartition(distance, k - 1)[:k]
+        error = fit["holdout_error"][nearest].max(axis=0)
+        return dict(zip(OUTPUTS, y.tolist())), dict(zip(OUTPUTS, error.tolist()))
+
+
+def train_surrogate(n_samples=20000, degree=4, holdout=0.2, seed=0):
+    """Sample the full sizing model and fit one surrogate per powertrain."""
+    rng = np.random.default_rng(seed)
+    fits = {}
+    for powertrain, space in INPUT_SPACE.items():
+        lower = np.array([lo for _, lo, _ in space])
+        upper = np.array([hi for _, _, hi in space])
+        X = lower + _latin_hypercube(rng, n_samples, len(space)) * (upper - lower)
+
+        altitude_col = [name for name, _, _ in space].index("cruise_altitude_ft")
+        rho = air_density(X[:, altitude_col] * 0.3048)
+        Y = np.array([
+            [size_aircraft(**_model_inputs(powertrain, row), rho=float(r))[name] for name in OUTPUTS]
+            for row, r in zip(X, rho)
+        ])
+        keep = Y[:, 0] <= MAX_TRAINED_MTOW_KG
+
+        exponents = _exponents(len(space), degree)
+        U = 2 * (X - lower) / (upper - lower) - 1
+        A = _features(U, exponents)
+        n_train = int(len(X) * (1 - holdout))
+        train = np.flatnonzero(keep[:n_train])
+        coefs, *_ = np.linalg.lstsq(A[train], np.log(Y[train]), rcond=None)
+
+        # Hold-out error over every design the surrogate would serve, including
+        # runaway designs that predict below the fallback threshold
+        predicted = np.exp(A[n_train:] @ coefs)
+        served = n_train + np.flatnonzero(predicted[:, 0] <= MAX_TRAINED_MTOW_KG * (1 - FALLBACK_MARGIN))
+        holdout_error = np.abs(predicted[served - n_train] / Y[served] - 1)
+
+        # Refit on every kept sample now that the error has been measured
+        coefs, *_ = np.linalg.lstsq(A[keep], np.log(Y[keep]), rcond=None)
+        fits[powertrain] = {
+            "lower": lower,
+            "upper": upper,
+            "exponents": exponents,
+            "coefs": coefs,
+            "holdout_inputs": U[served].astype(np.float32),
+            "holdout_error": holdout_error.astype(np.float32),
+        }
+    return Surrogate(fits)
+
+
+def instant_sizing(surrogate, inputs):
+    """Headline sizing numbers for the configuration panel.
+
+    ``inputs`` are ``size_aircraft`` keyword arguments. Uses the surrogate when
+    it is available and the inputs lie inside its trained region, otherwise
+    runs the full model. Returns a dict of outputs plus ``charger_kw`` and
+    ``p_peak_kw``, the relative ``error`` per output for similar designs (0
+    for the full model) and ``source`` ("surrogate" or "model").
+    """
+    defaults = {
+        name: param.default
+        for name, param in inspect.signature(size_aircraft).parameters.items()
+        if param.default is not inspect.Parameter.empty
+    }
+    values = {**defaults, **inputs}
+    powertrain = "hybrid" if values["is_hybrid"] else "electric"
+    values["payload_kg"] = values["num_pass"] * values["pass_weight_kg"] + values["cargo_kg"]
+
+    prediction = None
+    if surrogate is not None and all(values[name] == defaults[name] for name in FIXED_INPUTS):
+        x = [values[name] for name, _, _ in INPUT_SPACE[powertrain]]
+        prediction = surrogate.predict(powertrain, x)
+
+    if prediction is None:
+        result = size_aircraft(**inputs)
+        outputs = {name: result[name] for name in OUTPUTS}
+        error = dict.fromkeys(OUTPUTS, 0.0)
+        source = "model"
+    else:
+        outputs, error = prediction
+        source = "surrogate"
+
+    outputs["p_peak_kw"] = outputs["p_elec_cruise_w"] / 1000 * values["peak_to_cruise_ratio"]
+    outputs["charger_kw"] = outputs["battery_kwh"] * 0.8 / values["desired_charge_time_h"]
+    error["p_peak_kw"] = error["p_elec_cruise_w"]
+    error["charger_kw"] = error["battery_kwh"]
+    return {**outputs, "error": error, "source": source}
+
+
+if __name__ == "__main__":
+    surrogate = train_surrogate()
+    surrogate.save()
+    for powertrain, fit in surrogate.fits.items():
+        errors = ", ".join(f"{name} {err:.1%}" for name, err in zip(OUTPUTS, np.percentile(fit["holdout_error"], 95, axis=0)))
+        print(f"{powertrain}: 95th percentile hold-out error - {errors}")
+    print(f"Saved surrogate to {SURROGATE_PATH}")
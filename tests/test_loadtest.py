@@ -0,0 +1,88 @@
+import os
+
+import pytest
+from geopy.adapters import URLLibAdapter
+from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
+from geopy.geocoders import Nominatim
+
+import loadtest
+from loadtest import FakeNominatim
+
+
+@pytest.fixture
+def fake_server():
+    servers = []
+
+    def start(**kwargs):
+        fake = FakeNominatim(**kwargs)
+        servers.append(fake)
+        return fake, fake.start()
+
+    yield start
+    for fake in servers:
+        fake.stop()
+
+
+def test_places_are_deterministic():
+    places = FakeNominatim.places("Pune", 10)
+    assert places == FakeNominatim.places("pune", 10)
+    assert places != FakeNominatim.places("Jaipur", 10)
+    assert 1 <= len(places) <= 5
+    assert len(FakeNominatim.places("Pune", 1)) == 1
+    for place in places:
+        assert -35 <= float(place["lat"]) <= 35 and -20 <= float(place["lon"]) <= 90
+
+
+def test_geocoder_client_gets_fake_places(fake_server):
+    fake, domain = fake_server(latency_ms=0, jitter_ms=0)
+    geolocator = Nominatim(user_agent="loadtest_test", domain=domain, scheme="http", timeout=5)
+    location = geolocator.geocode("Pune")
+    expected = FakeNominatim.places("Pune", 1)[0]
+    assert (location.latitude, location.longitude) == (float(expected["lat"]), float(expected["lon"]))
+    assert (fake.requests, fake.timeouts) == (1, 0)
+
+
+def test_hanging_requests_time_out_on_the_client(fake_server):
+    fake, domain = fake_server(timeout_rate=1.0, hang_s=1.0)
+    # The urllib adapter does not retry, so one hang is one timed-out request
+    geolocator = Nominatim(user_agent="loadtest_test", domain=domain, scheme="http", timeout=0.2,
+                           adapter_factory=URLLibAdapter)
+    with pytest.raises(GeocoderTimedOut):
+        geolocator.geocode("Pune")
+    assert (fake.requests, fake.timeouts) == (1, 1)
+
+
+def test_hanging_requests_fail_the_retrying_client(fake_server):
+    fake, domain = fake_server(timeout_rate=1.0, hang_s=1.0)
+    # The app's default requests adapter retries, then reports the geocoder unavailable
+    geolocator = Nominatim(user_agent="loadtest_test", domain=domain, scheme="http", timeout=0.2)
+    with pytest.raises(GeocoderUnavailable):
+        geolocator.geocode("Pune")
+    assert fake.requests > 1
+    assert fake.timeouts == fake.requests
+
+
+class _FailingExecutor:
+    def __init__(self, *args, **kwargs):
+        raise RuntimeError("no workers")
+
+
+@pytest.mark.parametrize("previous", [None, ("nominatim.example.org", "https")])
+def test_run_load_test_restores_geocoder_environment(monkeypatch, previous):
+    for name, value in zip(("NOMINATIM_DOMAIN", "NOMINATIM_SCHEME"), previous or (None, None)):
+        if value is None:
+            monkeypatch.delenv(name, raising=False)
+        else:
+            monkeypatch.setenv(name, value)
+    seen = {}
+
+    def failing_executor(*args, **kwargs):
+        seen.update(domain=os.environ.get("NOMINATIM_DOMAIN"), scheme=os.environ.get("NOMINATIM_SCHEME"))
+        return _FailingExecutor()
+
+    monkeypatch.setattr(loadtest, "ProcessPoolExecutor", failing_executor)
+    with pytest.raises(RuntimeError):
+        loadtest.run_load_test(sessions=1, iterations=0)
+
+    assert seen["domain"].startswith("127.0.0.1:") and seen["scheme"] == "http"
+    assert (os.environ.get("NOMINATIM_DOMAIN"), os.environ.get("NOMINATIM_SCHEME")) == (previous or (None, None))
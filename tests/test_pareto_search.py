@@ -0,0 +1,74 @@
+import numpy as np
+
+import pareto_search
+from pareto_search import crowding_distance, non_dominated_sort, run_nsga2
+
+ROUTES = [
+    {"origin_name": "Bengaluru", "origin_lat": 13.1939, "origin_lon": 77.7064,
+     "dest_name": "Chennai", "dest_lat": 12.9896, "dest_lon": 80.1693, "dist_km": 340},
+    {"origin_name": "Bengaluru", "origin_lat": 13.1939, "origin_lon": 77.7064,
+     "dest_name": "Kochi", "dest_lat": 10.1924, "dest_lon": 76.2597, "dist_km": 350},
+]
+
+
+def test_non_dominated_sort_known_fronts():
+    F = np.array([
+        [1, 5], [2, 3], [4, 1],  # first front
+        [2, 6], [3, 4], [5, 2],  # each dominated by one of the first front
+        [6, 6],                  # dominated by everything above
+    ], dtype=float)
+    rank = non_dominated_sort(F, np.zeros(len(F)))
+    assert rank.tolist() == [0, 0, 0, 1, 1, 1, 2]
+
+
+def test_non_dominated_sort_ranks_infeasible_by_violation():
+    F = np.array([[0, 0], [0, 0], [9, 9]], dtype=float)
+    CV = np.array([1.0, 0.5, 0.0])
+    # Any feasible design beats any infeasible one; infeasible ones order by violation
+    assert non_dominated_sort(F, CV).tolist() == [2, 1, 0]
+
+
+def _brute_force_ranks(F, CV):
+    def dominates(i, j):
+        if CV[i] <= 0 < CV[j]:
+            return True
+        if CV[i] > 0 and CV[j] > 0:
+            return CV[i] < CV[j]
+        return CV[i] <= 0 and CV[j] <= 0 and np.all(F[i] <= F[j]) and np.any(F[i] < F[j])
+
+    rank = np.full(len(F), -1)
+    level = 0
+    while (rank < 0).any():
+        remaining = np.flatnonzero(rank < 0)
+        front = [j for j in remaining if not any(dominates(i, j) for i in remaining)]
+        rank[front] = level
+        level += 1
+    return rank
+
+
+def test_blocked_sort_matches_brute_force(monkeypatch):
+    rng = np.random.default_rng(3)
+    F = rng.integers(0, 6, size=(120, 3)).astype(float)  # plenty of ties
+    CV = np.where(rng.random(120) < 0.25, rng.integers(1, 4, 120) / 4, 0.0)
+    expected = _brute_force_ranks(F, CV)
+    # A tiny block size forces many partial blocks
+    monkeypatch.setattr(pareto_search, "DOMINATION_BLOCK_PAIRS", 7 * len(F))
+    assert non_dominated_sort(F, CV).tolist() == expected.tolist()
+
+
+def test_crowding_distance_boundaries_are_infinite():
+    F = np.array([[0, 4], [1, 3], [2, 2], [4, 0]], dtype=float)
+    distance = crowding_distance(F)
+    assert np.isinf(distance[[0, 3]]).all()
+    # Interior points: sum of normalised neighbour gaps over both objectives
+    assert np.allclose(distance[1:3], [2 / 4 + 2 / 4, 3 / 4 + 3 / 4])
+
+
+def test_run_nsga2_returns_mutually_non_dominated_designs():
+    front = run_nsga2({"max_dist_km": 350, "num_pass": 4, "cargo_kg": 0}, ROUTES, pop_size=40, n_generations=5)
+    assert front
+    F = np.array([[p["mtow_kg"], p["block_time_h"], p["energy_kwh_per_pax_km"]] for p in front])
+    for i in range(len(F)):
+        dominated = np.all(F <= F[i], axis=1) & np.any(F < F[i], axis=1)
+        assert not dominated.any()
+    assert [p["mtow_kg"] for p in front] == sorted(p["mtow_kg"] for p in front)
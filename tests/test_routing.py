@@ -0,0 +1,108 @@
+import heapq
+import math
+import random
+
+import pytest
+
+from routing import HYBRID_REFUEL_H, RouteGraph, airports_with_routes, graph_for_design
+from sizing_model import USABLE_FRACTION, size_aircraft
+
+
+def _random_airports(n=40, seed=0):
+    rng = random.Random(seed)
+    return {f"A{i:02d}": (rng.uniform(8, 30), rng.uniform(70, 90), f"Airport {i}") for i in range(n)}
+
+
+def _dijkstra_h(graph, origin, dest):
+    best = {origin: 0.0}
+    frontier = [(0.0, origin)]
+    while frontier:
+        elapsed_h, code = heapq.heappop(frontier)
+        if code == dest:
+            return elapsed_h
+        if elapsed_h > best[code]:
+            continue
+        for neighbour, dist_km in graph.adjacency[code]:
+            stop_h = 0.0 if code == origin else graph.stop_time_h(dist_km)
+            candidate = elapsed_h + stop_h + graph.block_time_h(dist_km)
+            if candidate < best.get(neighbour, math.inf):
+                best[neighbour] = candidate
+                heapq.heappush(frontier, (candidate, neighbour))
+    return None
+
+
+def _assert_matches_dijkstra(graph):
+    codes = sorted(graph.airports)
+    multi_stop = 0
+    for origin in codes:
+        for dest in codes:
+            if origin == dest:
+                continue
+            itinerary = graph.fastest_itinerary(origin, dest)
+            expected_h = _dijkstra_h(graph, origin, dest)
+            if expected_h is None:
+                assert itinerary is None
+                continue
+            assert itinerary["total_h"] == pytest.approx(expected_h)
+            assert itinerary["stops"][0] == origin and itinerary["stops"][-1] == dest
+            assert all(leg["dist_km"] <= graph.max_leg_km for leg in itinerary["legs"])
+            assert itinerary["total_h"] == pytest.approx(
+                sum(leg["block_h"] + leg["charge_h"] + leg["refuel_h"] for leg in itinerary["legs"])
+            )
+            multi_stop += len(itinerary["legs"]) > 1
+    assert multi_stop > 0
+
+
+def test_a_star_matches_dijkstra_on_every_pair():
+    graph = RouteGraph(_random_airports(), max_leg_km=700, cruise_speed_kmh=250,
+                       charger_kw=400, kwh_per_km=1.5, fixed_leg_kwh=8)
+    _assert_matches_dijkstra(graph)
+
+
+def test_a_star_matches_dijkstra_for_hybrid_design():
+    graph = graph_for_design(size_aircraft(560, 4, 50, is_hybrid=True), _random_airports())
+    assert graph.refuel_h == HYBRID_REFUEL_H
+    _assert_matches_dijkstra(graph)
+
+
+def test_hybrid_stops_recharge_only_the_electric_share():
+    result = size_aircraft(560, 4, 50, is_hybrid=True)
+    graph = graph_for_design(result, _random_airports(5))
+    electric_kwh = (result["e_taxi_j"] + result["e_climb_j"] + result["e_descent_j"]) / 3.6e6
+    usable_kwh = result["battery_kwh"] * USABLE_FRACTION
+    assert electric_kwh < usable_kwh
+    # Cruise is flown on fuel, so the recharge does not grow with leg length
+    for dist_km in (100, 300, 560):
+        assert graph.charge_time_h(dist_km) == pytest.approx(electric_kwh / result["charger_kw"])
+    assert graph.charge_time_h(560) * result["charger_kw"] <= usable_kwh
+
+
+def test_charge_is_capped_at_usable_battery():
+    graph = RouteGraph({}, max_leg_km=500, cruise_speed_kmh=200, charger_kw=100,
+                       kwh_per_km=1.0, fixed_leg_kwh=10, max_charge_kwh=150)
+    assert graph.charge_time_h(100) == pytest.approx(1.1)
+    assert graph.charge_time_h(400) == pytest.approx(1.5)
+    assert graph.stop_time_h(400) == pytest.approx(1.5)
+
+
+def test_unreachable_airport_returns_none():
+    airports = {"A": (12.0, 77.0, "A"), "B": (12.5, 77.5, "B"), "FAR": (28.0, 77.0, "Far")}
+    graph = RouteGraph(airports, max_leg_km=200, cruise_speed_kmh=200, charger_kw=300, kwh_per_km=1.0, fixed_leg_kwh=8)
+    assert graph.fastest_itinerary("A", "B")["stops"] == ["A", "B"]
+    assert graph.fastest_itinerary("A", "FAR") is None
+    assert graph.fastest_itinerary("A", "NOWHERE") is None
+
+
+def test_route_endpoints_merge_with_airports_by_rounded_coordinates():
+    airports = {"BLR": (13.1939, 77.7064, "Bangalore")}
+    routes = [{"origin_name": "Bengaluru", "origin_lat": 13.1941, "origin_lon": 77.7061,
+               "dest_name": "Mysuru", "dest_lat": 12.2958, "dest_lon": 76.6394, "dist_km": 140}]
+    merged, endpoints = airports_with_routes(airports, routes)
+    assert endpoints == [("BLR", "Mysuru")]
+    assert set(merged) == {"BLR", "Mysuru"}
+
+
+def test_graph_for_design_is_cached_per_design():
+    result = size_aircraft(400, 4, 0)
+    airports = _random_airports(10)
+    assert graph_for_design(result, airports) is graph_for_design(dict(result), dict(airports))
@@ -0,0 +1,94 @@
+import io
+import json
+import multiprocessing
+
+import pytest
+
+from scenario_store import ScenarioStore
+from sizing_model import size_aircraft
+
+BLR = (13.1939, 77.7064)
+HYD = (17.3850, 78.4867)
+MAA = (12.9896, 80.1693)
+
+
+def _route(origin, dest, dist_km):
+    return {"origin_name": "O", "origin_lat": origin[0], "origin_lon": origin[1],
+            "dest_name": "D", "dest_lat": dest[0], "dest_lon": dest[1], "dist_km": dist_km}
+
+
+def _save(store, name, routes, **inputs):
+    inputs = {"num_pass": 4, "cargo_kg": 0, "max_dist_km": max(r["dist_km"] for r in routes), **inputs}
+    return store.save_scenario(name, inputs, routes, size_aircraft(**inputs))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ScenarioStore(str(tmp_path / "scenarios.db"))
+
+
+def test_load_returns_saved_scenario_without_recomputation(store):
+    routes = [_route(BLR, HYD, 560), _route(BLR, MAA, 340)]
+    scenario_id = _save(store, "hub", routes)
+    scenario = store.load_scenario(scenario_id)
+    assert scenario["name"] == "hub"
+    assert scenario["routes"] == routes
+    assert all(type(r["dist_km"]) is int for r in scenario["routes"])
+    assert scenario["result"] == size_aircraft(**scenario["inputs"])
+    assert store.load_scenario(scenario_id + 1) is None
+
+
+def test_query_filters_on_outputs_and_route_in_either_direction(store):
+    light = _save(store, "light", [_route(BLR, HYD, 560)], num_pass=1, is_hybrid=True)
+    heavy = _save(store, "heavy", [_route(HYD, BLR, 560)], num_pass=12)
+    other = _save(store, "other", [_route(BLR, MAA, 340)], num_pass=1, is_hybrid=True)
+    mtow = {s["id"]: s["mtow_kg"] for s in store.list_scenarios()}
+    assert mtow[light] < 3000 < mtow[heavy]
+
+    assert [s["id"] for s in store.query(covers=(BLR, HYD))] == [light, heavy]
+    assert [s["id"] for s in store.query(covers=(HYD, BLR), max_mtow_kg=3000)] == [light]
+    assert {s["id"] for s in store.query(max_mtow_kg=3000)} == {light, other}
+    assert store.query(covers=(HYD, MAA)) == []
+    assert [s["id"] for s in store.query(is_hybrid=False)] == [heavy]
+
+
+def test_export_import_round_trip(store, tmp_path):
+    for i in range(7):
+        _save(store, f"s{i}", [_route(BLR, HYD, 560), _route(BLR, MAA, 300 + i)], num_pass=1 + i)
+    buffer = io.StringIO()
+    assert store.export_jsonl(buffer, batch_size=3) == 7
+
+    copy = ScenarioStore(str(tmp_path / "copy.db"))
+    buffer.seek(0)
+    assert copy.import_jsonl(buffer, batch_size=2) == 7
+
+    original = [store.load_scenario(s["id"]) for s in store.list_scenarios()]
+    imported = [copy.load_scenario(s["id"]) for s in copy.list_scenarios()]
+    assert [{k: v for k, v in s.items() if k != "id"} for s in imported] == \
+           [{k: v for k, v in s.items() if k != "id"} for s in original]
+    assert len(copy.query(covers=(BLR, HYD))) == 7
+    assert all(json.loads(line)["routes"] for line in buffer.getvalue().splitlines())
+
+
+def test_delete_removes_routes(store):
+    scenario_id = _save(store, "gone", [_route(BLR, HYD, 560)])
+    store.delete_scenario(scenario_id)
+    assert store.load_scenario(scenario_id) is None
+    assert store.query(covers=(BLR, HYD)) == []
+
+
+def _save_many(args):
+    path, worker = args
+    store = ScenarioStore(path)
+    for i in range(10):
+        _save(store, f"w{worker}-{i}", [_route(BLR, HYD, 560)])
+
+
+def test_concurrent_writers(tmp_path):
+    path = str(tmp_path / "shared.db")
+    ScenarioStore(path)
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        pool.map(_save_many, [(path, worker) for worker in range(4)])
+    store = ScenarioStore(path)
+    assert len(store.list_scenarios(limit=100)) == 40
+    assert store._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
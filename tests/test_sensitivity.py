@@ -0,0 +1,50 @@
+import inspect
+
+import numpy as np
+import pytest
+
+from sensitivity import INPUTS, OUTPUTS, density_with_gradient, sizing_jacobians
+from sizing_model import air_density, route_performance, size_aircraft
+
+DEFAULTS = {name: p.default for name, p in inspect.signature(size_aircraft).parameters.items()}
+ROUTES = [
+    {"origin_name": "Bengaluru", "origin_lat": 13.1939, "origin_lon": 77.7064,
+     "dest_name": "Chennai", "dest_lat": 12.9896, "dest_lon": 80.1693, "dist_km": 340},
+]
+POINTS = [
+    {"max_dist_km": 400, "num_pass": 4, "cargo_kg": 50},
+    {"max_dist_km": 600, "num_pass": 6, "cargo_kg": 0, "is_hybrid": True, "cruise_speed_kmh": 260},
+]
+
+
+def _outputs(point):
+    result = size_aircraft(**point)
+    values = [result[name] for name in OUTPUTS]
+    values += [p["margin_pct"] for p in route_performance(result, ROUTES)]
+    return np.array(values, dtype=float)
+
+
+@pytest.mark.parametrize("point", POINTS)
+def test_jacobian_matches_central_differences(point):
+    computed = sizing_jacobians([point], routes=ROUTES)[0]
+    jacobian = np.vstack([computed["jacobian"][name] for name in OUTPUTS] + [computed["jacobian"]["route_margin_pct"]])
+    assert np.allclose(
+        [computed["values"][name] for name in OUTPUTS] + computed["values"]["route_margin_pct"],
+        _outputs(point),
+    )
+
+    for i, name in enumerate(INPUTS):
+        x = float(point.get(name, DEFAULTS[name]))
+        h = 1e-6 * max(abs(x), 1.0)
+        central = (_outputs({**point, name: x + h}) - _outputs({**point, name: x - h})) / (2 * h)
+        scale = np.abs(_outputs(point)) / max(abs(x), 1.0)
+        assert np.allclose(jacobian[:, i], central, rtol=1e-4, atol=1e-6 * scale.max()), name
+
+
+def test_density_gradient_matches_model_atmosphere():
+    altitudes_m = np.array([0.0, 1000.0, 3000.0, 4800.0])
+    rho, drho = density_with_gradient(altitudes_m)
+    assert np.allclose(rho, air_density(altitudes_m))
+    h = 1e-2
+    central = (np.asarray(air_density(altitudes_m + h)) - np.asarray(air_density(altitudes_m - h))) / (2 * h)
+    assert np.allclose(drho, central, rtol=1e-5)
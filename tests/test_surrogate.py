@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from sizing_model import size_aircraft
+from surrogate import INPUT_SPACE, MAX_TRAINED_MTOW_KG, OUTPUTS, Surrogate, _model_inputs, instant_sizing
+
+
+@pytest.fixture(scope="module")
+def surrogate():
+    return Surrogate.load()
+
+
+@pytest.mark.parametrize("inputs", [
+    {"max_dist_km": 300, "num_pass": 4, "cargo_kg": 0},
+    {"max_dist_km": 560, "num_pass": 2, "cargo_kg": 100, "cruise_speed_kmh": 250},
+    {"max_dist_km": 800, "num_pass": 6, "cargo_kg": 0, "is_hybrid": True},
+])
+def test_instant_sizing_matches_model_within_reported_error(surrogate, inputs):
+    estimate = instant_sizing(surrogate, inputs)
+    result = size_aircraft(**inputs)
+    assert estimate["source"] == "surrogate"
+    for name in ("total_mass_kg", "battery_kwh"):
+        assert estimate[name] == pytest.approx(result[name], rel=estimate["error"][name])
+
+
+@pytest.mark.parametrize("powertrain", ["electric", "hybrid"])
+def test_error_estimate_is_calibrated_on_random_inputs(surrogate, powertrain):
+    rng = np.random.default_rng(11)
+    space = INPUT_SPACE[powertrain]
+    lower = np.array([lo for _, lo, _ in space])
+    upper = np.array([hi for _, _, hi in space])
+    errors, estimates = [], []
+    for x in lower + rng.random((400, len(space))) * (upper - lower):
+        prediction = surrogate.predict(powertrain, x)
+        if prediction is None:
+            continue
+        outputs, error = prediction
+        result = size_aircraft(**_model_inputs(powertrain, x))
+        errors.append([abs(outputs[name] / result[name] - 1) for name in OUTPUTS])
+        estimates.append([error[name] for name in OUTPUTS])
+    errors, estimates = np.array(errors), np.array(estimates)
+    assert len(errors) > 100
+    # Estimates vary with the query and few served designs exceed theirs
+    assert np.ptp(estimates[:, 0]) > 0
+    assert (errors > estimates).mean() < 0.1
+    assert (errors > 2 * estimates).mean() < 0.02
+
+
+def test_instant_sizing_falls_back_for_untrained_inputs(surrogate):
+    estimate = instant_sizing(surrogate, {"max_dist_km": 300, "num_pass": 4, "cargo_kg": 0, "ar_guess": 10})
+    assert estimate["source"] == "model"
+    assert estimate["total_mass_kg"] == size_aircraft(300, 4, 0, ar_guess=10)["total_mass_kg"]
+
+
+def test_instant_sizing_falls_back_near_runaway_designs(surrogate):
+    inputs = {"max_dist_km": 1400, "num_pass": 20, "cargo_kg": 0, "battery_density": 200}
+    assert size_aircraft(**inputs)["total_mass_kg"] > MAX_TRAINED_MTOW_KG
+    assert instant_sizing(surrogate, inputs)["source"] == "model"
+
+
+def test_instant_sizing_without_surrogate_uses_model():
+    estimate = instant_sizing(None, {"max_dist_km": 300, "num_pass": 4, "cargo_kg": 0})
+    assert estimate["source"] == "model"
+    assert estimate["error"]["total_mass_kg"] == 0.0